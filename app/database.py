@@ -3,9 +3,11 @@ Database service layer for Supabase PostgreSQL integration.
 """
 
 import os
+import hashlib
+import weakref
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
@@ -19,6 +21,10 @@ class DatabaseConnection:
 
     def __init__(self):
         self.connection_pool = None
+        # Transaction-mode poolers (e.g. pgbouncer) do not keep prepared statements
+        # between transactions; set DB_PREPARED_STATEMENTS=false when using one
+        self.use_prepared_statements = os.getenv('DB_PREPARED_STATEMENTS', 'true').lower() != 'false'
+        self._prepared_statements = weakref.WeakKeyDictionary()  # connection -> prepared names
         self._initialize_pool()
 
     def _initialize_pool(self):
@@ -30,11 +36,16 @@ class DatabaseConnection:
             database_url = self._build_connection_url()
 
         try:
-            # Create connection pool
-            self.connection_pool = SimpleConnectionPool(
-                minconn=1,
-                maxconn=10,
-                dsn=database_url
+            # Create connection pool; requests are served from several threads,
+            # and TCP keepalives stop idle pooled connections being dropped
+            self.connection_pool = ThreadedConnectionPool(
+                minconn=int(os.getenv('DB_POOL_MIN', 2)),
+                maxconn=int(os.getenv('DB_POOL_MAX', 10)),
+                dsn=database_url,
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=5
             )
             logger.info("Database connection pool initialized successfully")
         except Exception as e:
@@ -52,15 +63,20 @@ class DatabaseConnection:
         return f"postgresql://{user}:{password}@{host}:{port}/{database}"
 
     def get_connection(self):
-        """Get a connection from the pool."""
+        """Get an open connection from the pool."""
         if not self.connection_pool:
             raise Exception("Database connection pool not initialized")
-        return self.connection_pool.getconn()
+        conn = self.connection_pool.getconn()
+        while conn.closed:
+            # Dropped by the server while idle; discard it and take the next one
+            self.connection_pool.putconn(conn, close=True)
+            conn = self.connection_pool.getconn()
+        return conn
 
     def return_connection(self, conn):
-        """Return a connection to the pool."""
+        """Return a connection to the pool, discarding it if it has been closed."""
         if self.connection_pool:
-            self.connection_pool.putconn(conn)
+            self.connection_pool.putconn(conn, close=bool(conn.closed))
 
     def execute_query(self, query: str, params: tuple = None, fetch: bool = True) -> Optional[List[Dict]]:
         """Execute a database query."""
@@ -89,6 +105,64 @@ class DatabaseConnection:
             if conn:
                 self.return_connection(conn)
 
+    def execute_prepared(self, name: str, query: str, params: tuple = None,
+                         fetch: bool = True) -> Optional[List[Dict]]:
+        """Execute a query as a named server-side prepared statement.
+
+        The statement is prepared once per pooled connection, so repeat calls
+        skip parsing and planning. ``query`` uses the usual %s placeholders;
+        it must not contain ``%%`` or a %s inside a quoted literal (see
+        _prepare_placeholders).
+        """
+        if not self.use_prepared_statements:
+            return self.execute_query(query, params, fetch)
+
+        params = tuple(params or ())
+        conn = None
+        try:
+            conn = self.get_connection()
+            prepared = self._prepared_statements.setdefault(conn, set())
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if name not in prepared:
+                    cursor.execute(f"PREPARE {name} AS {_prepare_placeholders(query)}")
+                    prepared.add(name)
+
+                try:
+                    self._execute_statement(cursor, name, params)
+                except psycopg2.errors.FeatureNotSupported:
+                    # "cached plan must not change result type": a migration
+                    # changed the table under the statement; prepare it again
+                    conn.rollback()
+                    logger.warning(f"Re-preparing statement {name} after a schema change")
+                    cursor.execute(f"DEALLOCATE {name}")
+                    prepared.discard(name)
+                    cursor.execute(f"PREPARE {name} AS {_prepare_placeholders(query)}")
+                    prepared.add(name)
+                    self._execute_statement(cursor, name, params)
+
+                if fetch:
+                    return [dict(row) for row in cursor.fetchall()]
+                conn.commit()
+                return None
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database prepared query error: {e}")
+            logger.error(f"Query: {query}")
+            logger.error(f"Params: {params}")
+            raise
+        finally:
+            if conn:
+                self.return_connection(conn)
+
+    @staticmethod
+    def _execute_statement(cursor, name: str, params: tuple):
+        """EXECUTE a prepared statement with ``params``."""
+        if params:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
         """Execute a query with multiple parameter sets."""
         conn = None
@@ -106,6 +180,29 @@ class DatabaseConnection:
             if conn:
                 self.return_connection(conn)
 
+    def execute_values(self, query: str, params_list: List[tuple], page_size: int = 500,
+                       fetch: bool = False) -> Optional[List[Dict]]:
+        """Execute a multi-row VALUES query in a single transaction."""
+        conn = None
+        try:
+            logger.debug(f"Executing VALUES query: {query[:100]}... with {len(params_list)} rows")
+            conn = self.get_connection()
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                result = execute_values(cursor, query, params_list, page_size=page_size, fetch=fetch)
+                conn.commit()
+                if fetch:
+                    return [dict(row) for row in result]
+                return None
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Database execute_values error: {e}")
+            logger.error(f"Query: {query}")
+            raise
+        finally:
+            if conn:
+                self.return_connection(conn)
+
     def execute_insert_returning(self, query: str, params: tuple = None) -> Optional[str]:
         """Execute an INSERT query with RETURNING clause and return the single value."""
         conn = None
@@ -129,11 +226,13 @@ class DatabaseConnection:
         except Exception as e:
             if conn:
                 conn.rollback()
-            logger.error(f"Database INSERT error: {e}")
-            logger.error(f"Query: {query}")
-            logger.error(f"Params: {params}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            if isinstance(e, psycopg2.IntegrityError):
+                # Expected for duplicates - no stack trace needed
+                logger.warning(f"Database INSERT rejected: {e}")
+            else:
+                logger.exception(f"Database INSERT error: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Params: {params}")
             raise
         finally:
             if conn:
@@ -145,6 +244,68 @@ class DatabaseConnection:
             self.connection_pool.closeall()
 
 
+def _prepare_placeholders(query: str) -> str:
+    """Rewrite a query's %s placeholders as the $1, $2, ... that PREPARE takes.
+
+    The rewrite is a plain split on %s, so queries with a ``%%`` escape or a
+    %s inside a quoted literal are rejected rather than silently mangled.
+    """
+    if '%%' in query:
+        raise ValueError("Prepared queries cannot contain '%%'")
+    if any('%s' in literal for literal in query.split("'")[1::2]):
+        raise ValueError("Prepared queries cannot contain %s inside a quoted literal")
+
+    parts = query.strip().rstrip(';').split('%s')
+    return parts[0] + ''.join(f"${i}{part}" for i, part in enumerate(parts[1:], 1))
+
+
+# Category -> key templates use for its daily average
+_DAILY_AVERAGE_NAMES = {
+    'feeding': 'feedings',
+    'diaper': 'diaper_changes',
+    'sleep': 'sleep_sessions',
+    'milestone': 'milestones',
+    'health': 'health_events'
+}
+
+
+def _daily_averages(by_category: Dict[str, int], start_date: datetime) -> Dict[str, float]:
+    """Average activities per day for each category since ``start_date``."""
+    days = (datetime.now() - start_date).days + 1
+    # Use mapped name if available, otherwise use original category name
+    return {_DAILY_AVERAGE_NAMES.get(category, category): round(count / days, 1)
+            for category, count in by_category.items()}
+
+
+def _like_pattern(keyword: str) -> str:
+    """Build a LIKE pattern matching ``keyword`` anywhere in a string."""
+    escaped = keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def _build_upsert_query(table: str, columns: tuple) -> str:
+    """Build an INSERT ... ON CONFLICT (id) DO UPDATE statement for the given columns."""
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column != 'id')
+    return f"""
+    INSERT INTO {table} ({', '.join(columns)})
+    VALUES ({', '.join(['%s'] * len(columns))})
+    ON CONFLICT (id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+    RETURNING id;
+    """
+
+
+ACTIVITY_COLUMNS = ('id', 'profile_id', 'timestamp', 'category', 'activity_type', 'description',
+                    'amount', 'unit', 'duration_minutes', 'notes', 'tags', 'source', 'sender')
+REMINDER_COLUMNS = ('id', 'profile_id', 'reminder_type', 'activity_category', 'title', 'message',
+                    'enabled', 'recurrence_hours', 'scheduled_time', 'last_activity_hours',
+                    'last_triggered_at')
+
+_ACTIVITY_UPSERT_QUERY = _build_upsert_query('baby_activities', ACTIVITY_COLUMNS)
+# Explicit select list: a prepared "SELECT *" breaks as soon as a migration adds a column
+_ACTIVITY_SELECT = ', '.join(ACTIVITY_COLUMNS + ('created_at', 'updated_at'))
+_REMINDER_UPSERT_QUERY = _build_upsert_query('activity_reminders', REMINDER_COLUMNS)
+
+
 class DatabaseService:
     """High-level database service for baby journal operations."""
 
@@ -196,6 +357,10 @@ class DatabaseService:
                 "CREATE INDEX IF NOT EXISTS idx_activities_timestamp ON baby_activities(timestamp);",
                 "CREATE INDEX IF NOT EXISTS idx_activities_category ON baby_activities(category);",
                 "CREATE INDEX IF NOT EXISTS idx_activities_type ON baby_activities(activity_type);",
+                # Serves the "latest activities for a profile" listing and keyset pagination
+                "CREATE INDEX IF NOT EXISTS idx_activities_profile_ts ON baby_activities(profile_id, timestamp DESC);",
+                # Serves category-filtered listings newest first
+                "CREATE INDEX IF NOT EXISTS idx_activities_profile_category_ts ON baby_activities(profile_id, category, timestamp DESC);",
                 # Unique constraint to prevent duplicate activities
                 "CREATE UNIQUE INDEX IF NOT EXISTS idx_activities_unique ON baby_activities(profile_id, timestamp, description, COALESCE(amount, 0));"
             ]
@@ -282,7 +447,7 @@ class DatabaseService:
         (profile_id, timestamp, category, activity_type, description, amount, unit,
          duration_minutes, notes, tags, source, sender)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT ON CONSTRAINT idx_activities_unique DO NOTHING
+        ON CONFLICT DO NOTHING
         RETURNING id;
         """
         params = (profile_id, timestamp, category, activity_type, description, amount,
@@ -334,32 +499,128 @@ class DatabaseService:
         result = self.db.execute_insert_returning(insert_query, insert_params)
         return str(result) if result else None
 
+    def upsert_activity(self, **fields) -> Optional[str]:
+        """Insert an activity, or update it if one with the same id exists."""
+        params = tuple(fields.get(column) for column in ACTIVITY_COLUMNS)
+        try:
+            return self.db.execute_insert_returning(_ACTIVITY_UPSERT_QUERY, params)
+        except Exception as e:
+            logger.error(f"Error upserting activity: {e}")
+            return None
+
+    def create_activities_bulk(self, rows: List[Dict]) -> List[str]:
+        """Insert many activities in one statement, skipping duplicates.
+
+        Each row is a dict keyed by column name and must include a client-side
+        ``id``. Returns the ids that were actually inserted.
+        """
+        if not rows:
+            return []
+
+        query = f"""
+        INSERT INTO baby_activities ({', '.join(ACTIVITY_COLUMNS)})
+        VALUES %s
+        ON CONFLICT DO NOTHING
+        RETURNING id;
+        """
+        params_list = [tuple(row.get(column) for column in ACTIVITY_COLUMNS) for row in rows]
+
+        # Batches beyond ~1000 rows per statement stop paying off
+        result = self.db.execute_values(query, params_list, page_size=1000, fetch=True)
+        return [row['id'] for row in result]
+
     def get_activities(self, profile_id: str, limit: int = None,
-                      category: str = None, date: datetime = None) -> List[Dict]:
-        """Get activities with optional filtering."""
-        query = "SELECT * FROM baby_activities WHERE profile_id = %s"
+                      category: str = None, date: datetime = None,
+                      before: datetime = None, date_from: datetime = None,
+                      date_to: datetime = None, activity_type: str = None,
+                      before_id: str = None) -> List[Dict]:
+        """Get activities with optional filtering.
+
+        ``before`` is a keyset cursor: only activities strictly older than it
+        are returned, which avoids OFFSET scans when paging. Pass the id of the
+        previous page's last row as ``before_id`` so activities sharing its
+        timestamp are not skipped. ``date_from`` and ``date_to`` are inclusive
+        bounds.
+        """
+        query = f"SELECT {_ACTIVITY_SELECT} FROM baby_activities WHERE profile_id = %s"
         params = [profile_id]
+        # The filters in use pick the prepared statement, so each combination
+        # keeps its own plan instead of a catch-all "x IS NULL OR ..." query
+        used = []
 
         if category:
             query += " AND category = %s"
             params.append(category)
+            used.append('category')
+
+        if activity_type:
+            query += " AND activity_type = %s"
+            params.append(activity_type)
+            used.append('type')
 
         if date:
-            query += " AND DATE(timestamp) = DATE(%s)"
+            query += " AND DATE(timestamp) = DATE(%s::timestamp)"
             params.append(date)
-
-        query += " ORDER BY timestamp DESC"
+            used.append('date')
+
+        if date_from:
+            query += " AND timestamp >= %s"
+            params.append(date_from)
+            used.append('from')
+
+        if date_to:
+            query += " AND timestamp <= %s"
+            params.append(date_to)
+            used.append('to')
+
+        if before and before_id:
+            query += " AND (timestamp, id) < (%s, %s)"
+            params.extend((before, before_id))
+            used.append('after_row')
+        elif before:
+            query += " AND timestamp < %s"
+            params.append(before)
+            used.append('before')
+
+        # id breaks timestamp ties so keyset pages line up
+        query += " ORDER BY timestamp DESC, id DESC"
 
         if limit:
             query += " LIMIT %s"
             params.append(limit)
+            used.append('limit')
+
+        name = "_".join(["activities"] + used)
+        return self.db.execute_prepared(name, query, params) or []
+
+    def get_recent_activities(self, profile_id: str, limit: int) -> List[Dict]:
+        """Get the latest ``limit`` activities via a prepared statement."""
+        query = f"SELECT {_ACTIVITY_SELECT} FROM baby_activities WHERE profile_id = %s ORDER BY timestamp DESC, id DESC LIMIT %s;"
+        return self.db.execute_prepared("recent_activities", query, (profile_id, limit)) or []
+
+    def get_activities_page(self, profile_id: str, before: tuple = None,
+                            limit: int = 500) -> List[Dict]:
+        """Get one page of activities, newest first.
+
+        ``before`` is the ``(timestamp, id)`` of the last row of the previous
+        page; the id breaks ties between activities sharing a timestamp.
+        """
+        query = f"SELECT {_ACTIVITY_SELECT} FROM baby_activities WHERE profile_id = %s"
+        params = [profile_id]
+
+        if before:
+            query += " AND (timestamp, id) < (%s, %s)"
+            params.extend(before)
+
+        query += " ORDER BY timestamp DESC, id DESC LIMIT %s"
+        params.append(limit)
 
         return self.db.execute_query(query, params) or []
 
     def get_activity_by_id(self, activity_id: str) -> Optional[Dict]:
         """Get single activity by ID."""
-        query = "SELECT * FROM baby_activities WHERE id = %s;"
-        result = self.db.execute_query(query, (activity_id,))
+        query = f"SELECT {_ACTIVITY_SELECT} FROM baby_activities WHERE id = %s;"
+        result = self.db.execute_prepared("get_activity_by_id", query, (activity_id,))
         return result[0] if result else None
 
     def update_activity(self, activity_id: str, **updates) -> bool:
@@ -374,9 +635,11 @@ class DatabaseService:
         WHERE id = %s;
         """
         params = list(updates.values()) + [activity_id]
+        # One prepared statement per distinct set of updated columns
+        name = "update_activity_" + hashlib.md5(",".join(updates).encode()).hexdigest()[:16]
 
         try:
-            self.db.execute_query(query, params, fetch=False)
+            self.db.execute_prepared(name, query, params, fetch=False)
             return True
         except Exception as e:
             logger.error(f"Error updating activity: {e}")
@@ -386,12 +649,132 @@ class DatabaseService:
         """Delete activity by ID."""
         query = "DELETE FROM baby_activities WHERE id = %s;"
         try:
-            self.db.execute_query(query, (activity_id,), fetch=False)
+            self.db.execute_prepared("delete_activity", query, (activity_id,), fetch=False)
             return True
         except Exception as e:
             logger.error(f"Error deleting activity: {e}")
             return False
 
+    def delete_all_activities(self, profile_id: str) -> None:
+        """Delete every activity for a profile.
+
+        The commit does not wait for the WAL flush; a crash right after can
+        at worst undo the wipe, never corrupt data. The planner statistics
+        are refreshed afterwards since the table may have shrunk a lot.
+        """
+        query = """
+        SET LOCAL synchronous_commit = off;
+        DELETE FROM baby_activities WHERE profile_id = %s;
+        """
+        self.db.execute_query(query, (profile_id,), fetch=False)
+        self.db.execute_query("ANALYZE baby_activities;", fetch=False)
+
+    def get_activity_stats_grouped(self, profile_id: str) -> Dict:
+        """Get counts by category and by type, daily averages and the date range in one scan."""
+        query = """
+        SELECT
+            category,
+            activity_type,
+            COUNT(*) as count,
+            MIN(timestamp) as earliest_activity,
+            MAX(timestamp) as latest_activity,
+            GROUPING(category, activity_type) as grouping_level
+        FROM baby_activities
+        WHERE profile_id = %s
+        GROUP BY GROUPING SETS ((category), (activity_type), ());
+        """
+
+        result = self.db.execute_query(query, (profile_id,)) or []
+
+        stats = {
+            'total_activities': 0,
+            'by_category': {},
+            'by_type': {},
+            'daily_averages': {},
+            'date_range': {}
+        }
+        for row in result:
+            if row['grouping_level'] == 1:
+                stats['by_category'][row['category']] = row['count']
+            elif row['grouping_level'] == 2:
+                stats['by_type'][row['activity_type']] = row['count']
+            elif row['count']:
+                stats['total_activities'] = row['count']
+                start_date = row['earliest_activity']
+                stats['date_range'] = {
+                    'start': start_date.isoformat(),
+                    'end': row['latest_activity'].isoformat()
+                }
+
+        if not stats['total_activities']:
+            return {}
+
+        stats['daily_averages'] = _daily_averages(stats['by_category'], start_date)
+        return stats
+
+    def get_feeding_metrics(self, profile_id: str, type_keywords: tuple,
+                            default_type: str) -> Dict:
+        """Aggregate a profile's feedings in one query.
+
+        ``type_keywords`` is an ordered tuple of (feeding_type, keywords); a
+        feeding gets the first type whose keywords appear in its lower-cased
+        description, else ``default_type``. Returns total_feeds, days_tracked,
+        total_amount and avg_amount (over positive amounts) and a
+        ``by_type`` count per feeding type.
+        """
+        cases = []
+        params = []
+        for feeding_type, keywords in type_keywords:
+            cases.append("WHEN lower(COALESCE(description, '')) LIKE ANY(%s) THEN %s")
+            params.extend([[_like_pattern(keyword) for keyword in keywords], feeding_type])
+        params.extend([default_type, profile_id])
+
+        query = f"""
+        SELECT
+            feeding_type,
+            COUNT(*) as count,
+            COUNT(DISTINCT timestamp::date) as days,
+            SUM(amount) FILTER (WHERE amount > 0) as total_amount,
+            COUNT(amount) FILTER (WHERE amount > 0) as amount_count,
+            GROUPING(feeding_type) as grouping_level
+        FROM (
+            SELECT timestamp, amount,
+                   CASE {' '.join(cases)} ELSE %s END as feeding_type
+            FROM baby_activities
+            WHERE profile_id = %s AND category = 'feeding'
+        ) feeds
+        GROUP BY GROUPING SETS ((feeding_type), ());
+        """
+
+        result = self.db.execute_query(query, tuple(params)) or []
+
+        metrics = {'total_feeds': 0, 'days_tracked': 0, 'total_amount': 0.0,
+                   'avg_amount': 0.0, 'by_type': {}}
+        for row in result:
+            if row['grouping_level'] == 0:
+                metrics['by_type'][row['feeding_type']] = row['count']
+            elif row['count']:
+                total_amount = float(row['total_amount'] or 0)
+                metrics.update({
+                    'total_feeds': row['count'],
+                    'days_tracked': row['days'],
+                    'total_amount': total_amount,
+                    'avg_amount': total_amount / row['amount_count'] if row['amount_count'] else 0.0
+                })
+        return metrics
+
+    def get_feeding_daily_totals(self, profile_id: str) -> List[Dict]:
+        """Get the total amount fed per day (including days with no amounts), oldest first."""
+        query = """
+        SELECT timestamp::date as date, COALESCE(SUM(amount), 0) as amount
+        FROM baby_activities
+        WHERE profile_id = %s AND category = 'feeding'
+        GROUP BY 1
+        ORDER BY 1;
+        """
+        rows = self.db.execute_query(query, (profile_id,)) or []
+        return [{'date': row['date'].isoformat(), 'amount': float(row['amount'])} for row in rows]
+
     def get_activity_statistics(self, profile_id: str) -> Dict:
         """Get activity statistics for a profile."""
         query = """
@@ -420,26 +803,8 @@ class DatabaseService:
             }
         }
 
-        # Calculate daily averages
         start_date = min(row['earliest_activity'] for row in result)
-        days = (datetime.now() - start_date).days + 1
-
-        # Map category names to match template expectations
-        category_mapping = {
-            'feeding': 'feedings',
-            'diaper': 'diaper_changes',
-            'sleep': 'sleep_sessions',
-            'milestone': 'milestones',
-            'health': 'health_events'
-        }
-
-        stats['daily_averages'] = {}
-        for row in result:
-            category = row['category']
-            daily_avg = round(row['category_count'] / days, 1)
-            # Use mapped name if available, otherwise use original category name
-            mapped_name = category_mapping.get(category, category)
-            stats['daily_averages'][mapped_name] = daily_avg
+        stats['daily_averages'] = _daily_averages(stats['by_category'], start_date)
 
         return stats
 
@@ -466,6 +831,15 @@ class DatabaseService:
             logger.error(f"Error creating reminder: {e}")
             return None
 
+    def upsert_reminder(self, **fields) -> Optional[str]:
+        """Insert a reminder, or update it if one with the same id exists."""
+        params = tuple(fields.get(column) for column in REMINDER_COLUMNS)
+        try:
+            return self.db.execute_insert_returning(_REMINDER_UPSERT_QUERY, params)
+        except Exception as e:
+            logger.error(f"Error upserting reminder: {e}")
+            return None
+
     def get_reminders(self, profile_id: str, enabled_only: bool = False) -> List[Dict]:
         """Get all reminders for a profile."""
         query = "SELECT * FROM activity_reminders WHERE profile_id = %s"
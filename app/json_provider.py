@@ -0,0 +1,41 @@
+"""
+orjson-backed JSON provider for Flask.
+"""
+
+import json
+from datetime import date
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+
+def _default(obj):
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, date):
+        # Match Flask's default provider, which emits HTTP dates rather than ISO 8601
+        return http_date(obj)
+    if isinstance(obj, Decimal):
+        # Match Flask's default provider, which emits decimals as strings
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that encodes with orjson."""
+
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize data as a JSON string."""
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize data from a JSON string or bytes."""
+        if kwargs:
+            # orjson has no hooks; the session serializer needs object_hook
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
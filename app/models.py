@@ -2,12 +2,23 @@
 Data models for baby activity journal.
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict
+from datetime import date, datetime
+from typing import Optional, List, Dict, Union
+import atexit
 import json
+import logging
 import os
+import queue
+import threading
+import uuid
+from collections import Counter
 from dataclasses import dataclass, asdict
 from enum import Enum
+from operator import attrgetter
+
+import orjson
+
+logger = logging.getLogger(__name__)
 
 
 class ActivityCategory(Enum):
@@ -81,7 +92,6 @@ class BabyActivity:
     def __post_init__(self):
         """Generate unique ID if not provided."""
         if self.id is None:
-            import uuid
             self.id = str(uuid.uuid4())
 
     def to_dict(self) -> Dict:
@@ -155,10 +165,44 @@ class ActivityJournal:
 
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
-        self.activities: List[BabyActivity] = []
+        self._activities: List[BabyActivity] = []
+        # id -> activity, built lazily and dropped whenever the list is replaced
+        self._by_id: Optional[Dict[str, BabyActivity]] = None
         self.profile: Optional[BabyProfile] = None
+        # Bumped on every change to activities; cached aggregates are keyed on it
+        self.revision = 0
+        self._stats_cache = None
+        # (revision, by_date, by_category) lookup tables, rebuilt when revision changes
+        self._group_cache = None
+        # Set by start_background_saves(); None means saves are written inline
+        self._save_queue: Optional[queue.Queue] = None
         self._ensure_data_dir()
 
+    def bump(self):
+        """Mark activities as changed so cached aggregates are recomputed."""
+        self.revision += 1
+
+    @property
+    def activities(self) -> List[BabyActivity]:
+        """All activities in the journal."""
+        return self._activities
+
+    @activities.setter
+    def activities(self, activities: List[BabyActivity]):
+        self._activities = activities
+        self._by_id = None
+        self.bump()
+
+    def _id_index(self) -> Dict[str, BabyActivity]:
+        """Return the id -> activity index, building it if needed."""
+        if self._by_id is None:
+            by_id = {}
+            for activity in self._activities:
+                # Keep the first activity for an id, as the old linear scan did
+                by_id.setdefault(activity.id, activity)
+            self._by_id = by_id
+        return self._by_id
+
     def _ensure_data_dir(self):
         """Ensure data directory exists."""
         if not os.path.exists(self.data_dir):
@@ -192,102 +236,231 @@ class ActivityJournal:
                 return self.profile
         return None
 
+    @staticmethod
+    def _assign_id(activity):
+        """Give an activity a uuid4 id if it has none.
+
+        ActivityProcessor builds database-model activities, which only get an
+        id when saved to the database; this journal needs one up front.
+        """
+        if not activity.id:
+            activity.id = str(uuid.uuid4())
+
     def add_activity(self, activity: BabyActivity):
         """Add a new activity to journal."""
+        self._assign_id(activity)
         self.activities.append(activity)
+        if self._by_id is not None:
+            self._by_id.setdefault(activity.id, activity)
+        self._save_activities()
+
+    def add_activities(self, activities: List[BabyActivity]):
+        """Add several activities to journal with a single save."""
+        for activity in activities:
+            self._assign_id(activity)
+        self.activities.extend(activities)
+        if self._by_id is not None:
+            for activity in activities:
+                self._by_id.setdefault(activity.id, activity)
         self._save_activities()
 
+    def start_background_saves(self):
+        """Write activities from a background thread instead of the caller's.
+
+        Saves requested while a write is pending are coalesced into one write
+        of the latest state. Pending writes are flushed at interpreter exit.
+        """
+        if self._save_queue is not None:
+            return
+        self._save_queue = queue.Queue()
+        threading.Thread(target=self._save_worker, name='journal-writer', daemon=True).start()
+        atexit.register(self.flush)
+
+    def flush(self):
+        """Block until all requested saves have been written."""
+        if self._save_queue is not None:
+            self._save_queue.join()
+
+    def _save_worker(self):
+        """Drain save requests and write the current activities once per burst."""
+        while True:
+            self._save_queue.get()
+            pending = 1
+            while True:
+                try:
+                    self._save_queue.get_nowait()
+                except queue.Empty:
+                    break
+                pending += 1
+
+            try:
+                self._write_activities()
+            except Exception as e:
+                logger.error(f"Error saving activities: {e}")
+            finally:
+                for _ in range(pending):
+                    self._save_queue.task_done()
+
     def _save_activities(self):
         """Save activities to file."""
+        self.bump()
+        if self._save_queue is not None:
+            self._save_queue.put(None)
+            return
+        self._write_activities()
+
+    def _write_activities(self):
+        """Write all activities to the JSON file."""
         activities_path = os.path.join(self.data_dir, 'activities.json')
-        with open(activities_path, 'w') as f:
-            data = [activity.to_dict() for activity in self.activities]
-            json.dump(data, f, indent=2, default=str)
+        # orjson serializes the dataclasses, enums and datetimes natively,
+        # producing the same document as to_dict() + json.dump
+        with open(activities_path, 'wb') as f:
+            f.write(orjson.dumps(self.activities, default=str, option=orjson.OPT_INDENT_2))
 
     def load_activities(self) -> List[BabyActivity]:
         """Load activities from file."""
         activities_path = os.path.join(self.data_dir, 'activities.json')
         if os.path.exists(activities_path):
-            with open(activities_path, 'r') as f:
-                data = json.load(f)
+            with open(activities_path, 'rb') as f:
+                data = orjson.loads(f.read())
                 self.activities = [BabyActivity.from_dict(item) for item in data]
                 return self.activities
         return []
 
-    def get_activities_by_date(self, date: datetime) -> List[BabyActivity]:
-        """Get activities for a specific date."""
-        target_date = date.date()
-        return [a for a in self.activities if a.timestamp.date() == target_date]
+    def _group_indexes(self):
+        """Return (newest_first, by_date, by_category) for the current revision.
+
+        Groups are filled from the newest-first list, so each one is already in
+        the same order as sorting it by timestamp descending would give.
+        Keyed on revision rather than updated in place, because activities are
+        edited by assigning their fields directly before saving.
+        """
+        cache = self._group_cache
+        if cache is not None and cache[0] == self.revision:
+            return cache[1], cache[2], cache[3]
+
+        newest_first = sorted(self.activities, key=attrgetter('timestamp'), reverse=True)
+        by_date = {}
+        by_category = {}
+        for activity in newest_first:
+            by_date.setdefault(activity.timestamp.date(), []).append(activity)
+            by_category.setdefault(activity.category, []).append(activity)
+        self._group_cache = (self.revision, newest_first, by_date, by_category)
+        return newest_first, by_date, by_category
+
+    def get_sorted_activities(self) -> List[BabyActivity]:
+        """Get all activities, newest first."""
+        newest_first, _, _ = self._group_indexes()
+        return list(newest_first)
+
+    def get_activities_by_date(self, target: Union[date, datetime]) -> List[BabyActivity]:
+        """Get activities for a specific date, newest first (a datetime is reduced to its date)."""
+        if isinstance(target, datetime):
+            target = target.date()
+        _, by_date, _ = self._group_indexes()
+        return list(by_date.get(target, ()))
 
     def get_activities_by_category(self, category: ActivityCategory) -> List[BabyActivity]:
-        """Get activities by category."""
-        return [a for a in self.activities if a.category == category]
+        """Get activities by category, newest first."""
+        _, _, by_category = self._group_indexes()
+        return list(by_category.get(category, ()))
 
     def get_recent_activities(self, limit: int = 10) -> List[BabyActivity]:
         """Get most recent activities."""
-        sorted_activities = sorted(self.activities, key=lambda x: x.timestamp, reverse=True)
-        return sorted_activities[:limit]
+        newest_first, _, _ = self._group_indexes()
+        return newest_first[:limit]
 
     def get_statistics(self) -> Dict:
-        """Get statistics about activities."""
+        """Get statistics about activities.
+
+        The result is cached until activities change or another day passes, so
+        callers must treat it as read-only.
+        """
         if not self.activities:
             return {}
 
+        cache = self._stats_cache
+        if cache is not None and cache[0] == self.revision:
+            earliest = cache[1]
+            days = (datetime.now() - earliest).days + 1
+            if days == cache[2]:
+                return cache[3]
+        else:
+            earliest = min(a.timestamp for a in self.activities)
+            days = (datetime.now() - earliest).days + 1
+
         stats = {
             'total_activities': len(self.activities),
             'by_category': {},
             'by_type': {},
             'daily_averages': {},
             'date_range': {
-                'start': min(a.timestamp for a in self.activities).isoformat(),
+                'start': earliest.isoformat(),
                 'end': max(a.timestamp for a in self.activities).isoformat()
             }
         }
 
+        # Tally categories and types once rather than filtering a list per value
+        category_counts = Counter(a.category for a in self.activities)
+        type_counts = Counter(a.activity_type for a in self.activities)
+
         # Count by category
         for category in ActivityCategory:
-            count = len([a for a in self.activities if a.category == category])
+            count = category_counts[category]
             if count > 0:
                 stats['by_category'][category.value] = count
 
         # Count by type
         for activity_type in ActivityType:
-            count = len([a for a in self.activities if a.activity_type == activity_type])
+            count = type_counts[activity_type]
             if count > 0:
                 stats['by_type'][activity_type.value] = count
 
-        # Calculate daily averages
-        days = (datetime.now() - min(a.timestamp for a in self.activities)).days + 1
+        # Calculate daily averages over the days computed above
 
         # Feeding frequency
-        feeding_count = len([a for a in self.activities if a.category == ActivityCategory.FEEDING])
+        feeding_count = category_counts[ActivityCategory.FEEDING]
         stats['daily_averages']['feedings'] = round(feeding_count / days, 1)
 
         # Diaper changes
-        diaper_count = len([a for a in self.activities if a.category == ActivityCategory.DIAPER])
+        diaper_count = category_counts[ActivityCategory.DIAPER]
         stats['daily_averages']['diaper_changes'] = round(diaper_count / days, 1)
 
         # Sleep sessions
-        sleep_count = len([a for a in self.activities if a.category == ActivityCategory.SLEEP])
+        sleep_count = category_counts[ActivityCategory.SLEEP]
         stats['daily_averages']['sleep_sessions'] = round(sleep_count / days, 1)
 
+        self._stats_cache = (self.revision, earliest, days, stats)
         return stats
 
+    def get_statistics_tag(self) -> str:
+        """Return a tag that changes whenever get_statistics() would return new data."""
+        if not self.activities:
+            return str(self.revision)
+        self.get_statistics()
+        return f"{self.revision}-{self._stats_cache[2]}"
+
     def get_activity_by_id(self, activity_id: str) -> Optional[BabyActivity]:
         """Get activity by ID."""
-        for activity in self.activities:
-            if activity.id == activity_id:
-                return activity
-        return None
+        return self._id_index().get(activity_id)
 
     def delete_activity_by_id(self, activity_id: str) -> bool:
         """Delete activity by ID."""
-        for i, activity in enumerate(self.activities):
-            if activity.id == activity_id:
-                self.activities.pop(i)
-                self._save_activities()
-                return True
-        return False
+        activity = self._id_index().pop(activity_id, None)
+        if activity is None:
+            return False
+
+        for i, candidate in enumerate(self._activities):
+            if candidate is activity:
+                self._activities.pop(i)
+                break
+        # A later activity sharing the id (e.g. a re-imported file) now answers for it
+        for candidate in self._activities[i:]:
+            if candidate.id == activity_id:
+                self._by_id[activity_id] = candidate
+                break
+        self._save_activities()
+        return True
 
     def update_activity_by_id(self, activity_id: str, updates: Dict) -> bool:
         """Update activity by ID."""
@@ -297,6 +470,8 @@ class ActivityJournal:
             for field, value in updates.items():
                 if hasattr(activity, field):
                     setattr(activity, field, value)
+            if 'id' in updates:
+                self._by_id = None
             self._save_activities()
             return True
         return False
\ No newline at end of file
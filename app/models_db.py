@@ -3,12 +3,17 @@ Database-backed models for baby activity journal.
 This replaces the JSON-based models with database persistence.
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict
+from collections import Counter
+from datetime import datetime, date
+from typing import Optional, List, Dict, Iterator
 from dataclasses import dataclass
 from enum import Enum
-import uuid
+from operator import attrgetter
+import os
 import logging
+import time
+
+import psycopg2
 
 from .database import get_db_service
 from .models import ActivityCategory, ActivityType  # Import enums from original models
@@ -23,7 +28,25 @@ class ReminderType(Enum):
     ACTIVITY_BASED = "activity_based"  # e.g., if no feeding in last 4 hours
 
 
-@dataclass
+def _new_id() -> str:
+    """Generate a canonical UUID4 string straight from os.urandom (no uuid.UUID object)."""
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# Seconds that statistics are reused across requests
+RESULT_CACHE_TTL = 30
+
+# Value -> member lookups used when hydrating rows (cheaper than Enum(value) per row)
+_CATEGORY_MAP = {member.value: member for member in ActivityCategory}
+_TYPE_MAP = {member.value: member for member in ActivityType}
+_REMINDER_MAP = {member.value: member for member in ReminderType}
+
+
+@dataclass(slots=True)
 class DailyActivityGoal:
     """Represents an age-appropriate daily activity goal."""
     activity_key: str
@@ -49,10 +72,13 @@ class DailyActivityGoal:
     def __post_init__(self):
         """Generate unique ID if not provided."""
         if self.id is None:
-            self.id = str(uuid.uuid4())
+            self.id = _new_id()
 
     def to_dict(self) -> Dict:
-        """Convert goal to dictionary."""
+        """Convert goal to dictionary.
+
+        Datetimes are left as-is for the orjson JSON provider to serialize.
+        """
         return {
             'id': self.id,
             'profile_id': self.profile_id,
@@ -71,16 +97,16 @@ class DailyActivityGoal:
             'benefits': self.benefits,
             'enabled': self.enabled,
             'priority': self.priority,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     @classmethod
     def from_db_row(cls, row: Dict) -> 'DailyActivityGoal':
         """Create goal from database row."""
         return cls(
-            id=str(row['id']),
-            profile_id=str(row['profile_id']),
+            id=row['id'],
+            profile_id=row['profile_id'],
             activity_key=row['activity_key'],
             activity_title=row['activity_title'],
             activity_description=row['activity_description'],
@@ -101,7 +127,7 @@ class DailyActivityGoal:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyActivityProgress:
     """Represents daily progress for an activity goal."""
     goal_id: str
@@ -119,7 +145,7 @@ class DailyActivityProgress:
     def __post_init__(self):
         """Generate unique ID if not provided."""
         if self.id is None:
-            self.id = str(uuid.uuid4())
+            self.id = _new_id()
 
     def to_dict(self) -> Dict:
         """Convert progress to dictionary."""
@@ -127,23 +153,23 @@ class DailyActivityProgress:
             'id': self.id,
             'goal_id': self.goal_id,
             'profile_id': self.profile_id,
-            'activity_date': self.activity_date.date().isoformat() if isinstance(self.activity_date, datetime) else self.activity_date.isoformat(),
+            'activity_date': self.activity_date.date() if isinstance(self.activity_date, datetime) else self.activity_date,
             'current_count': self.current_count,
             'completed': self.completed,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'completed_at': self.completed_at,
             'streak_days': self.streak_days,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     @classmethod
     def from_db_row(cls, row: Dict) -> 'DailyActivityProgress':
         """Create progress from database row."""
         return cls(
-            id=str(row['id']),
-            goal_id=str(row['goal_id']),
-            profile_id=str(row['profile_id']),
+            id=row['id'],
+            goal_id=row['goal_id'],
+            profile_id=row['profile_id'],
             activity_date=row['activity_date'],
             current_count=row['current_count'],
             completed=row['completed'],
@@ -155,7 +181,7 @@ class DailyActivityProgress:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class BabyActivity:
     """Represents a single baby activity with database persistence."""
     timestamp: datetime
@@ -172,10 +198,15 @@ class BabyActivity:
     id: Optional[str] = None
     profile_id: Optional[str] = None
 
-    def __post_init__(self):
-        """Generate unique ID if not provided."""
+    def ensure_id(self) -> str:
+        """Return the activity ID, generating one if it has not been assigned yet.
+
+        New activities normally get their ID from the database on save; this
+        is for callers that need an ID up front.
+        """
         if self.id is None:
-            self.id = str(uuid.uuid4())
+            self.id = _new_id()
+        return self.id
 
     def to_dict(self) -> Dict:
         """Convert activity to dictionary."""
@@ -198,9 +229,9 @@ class BabyActivity:
     @classmethod
     def from_dict(cls, data: Dict) -> 'BabyActivity':
         """Create activity from dictionary."""
-        # Handle datetime conversion
+        # Handle datetime conversion (fromisoformat accepts a trailing 'Z' since 3.11)
         if isinstance(data['timestamp'], str):
-            data['timestamp'] = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
+            data['timestamp'] = datetime.fromisoformat(data['timestamp'])
 
         # Handle enum conversion
         data['category'] = ActivityCategory(data['category'])
@@ -212,34 +243,34 @@ class BabyActivity:
     def from_db_row(cls, row: Dict) -> 'BabyActivity':
         """Create activity from database row."""
         try:
-            # Try to convert category and activity_type with fallback to OTHER
-            try:
-                category = ActivityCategory(row['category'])
-            except (ValueError, KeyError):
+            # Convert category and activity_type with fallback to OTHER
+            category = _CATEGORY_MAP.get(row.get('category'))
+            if category is None:
                 logger.warning(f"Invalid category '{row.get('category')}' for activity {row.get('id')}, using OTHER")
                 category = ActivityCategory.OTHER
 
-            try:
-                activity_type = ActivityType(row['activity_type'])
-            except (ValueError, KeyError):
+            activity_type = _TYPE_MAP.get(row.get('activity_type'))
+            if activity_type is None:
                 logger.warning(f"Invalid activity_type '{row.get('activity_type')}' for activity {row.get('id')}, using OTHER")
                 activity_type = ActivityType.OTHER
 
-            return cls(
-                id=str(row['id']),
-                profile_id=str(row['profile_id']),
-                timestamp=row['timestamp'],
-                category=category,
-                activity_type=activity_type,
-                description=row['description'],
-                amount=row['amount'],
-                unit=row['unit'],
-                duration_minutes=row['duration_minutes'],
-                notes=row['notes'],
-                tags=row['tags'] or [],
-                source=row['source'],
-                sender=row['sender']
-            )
+            # Populate slots directly; rows are complete, so __init__ has nothing to add.
+            # psycopg2 returns UUID columns as str (no UUID adapter is registered)
+            activity = cls.__new__(cls)
+            activity.id = row['id']
+            activity.profile_id = row['profile_id']
+            activity.timestamp = row['timestamp']
+            activity.category = category
+            activity.activity_type = activity_type
+            activity.description = row['description']
+            activity.amount = row['amount']
+            activity.unit = row['unit']
+            activity.duration_minutes = row['duration_minutes']
+            activity.notes = row['notes']
+            activity.tags = row['tags'] or []
+            activity.source = row['source']
+            activity.sender = row['sender']
+            return activity
         except Exception as e:
             logger.error(f"Failed to create activity from database row: {e}")
             logger.error(f"Row data: {row}")
@@ -253,42 +284,30 @@ class BabyActivity:
 
         try:
             db = get_db_service()
-            if self.id and db.get_activity_by_id(self.id):
-                # Update existing activity
-                return db.update_activity(
-                    self.id,
-                    timestamp=self.timestamp,
-                    category=self.category.value,
-                    activity_type=self.activity_type.value,
-                    description=self.description,
-                    amount=self.amount,
-                    unit=self.unit,
-                    duration_minutes=self.duration_minutes,
-                    notes=self.notes,
-                    tags=self.tags,
-                    source=self.source,
-                    sender=self.sender
-                )
-            else:
-                # Create new activity
-                new_id = db.create_activity(
-                    profile_id=self.profile_id,
-                    timestamp=self.timestamp,
-                    category=self.category.value,
-                    activity_type=self.activity_type.value,
-                    description=self.description,
-                    amount=self.amount,
-                    unit=self.unit,
-                    duration_minutes=self.duration_minutes,
-                    notes=self.notes,
-                    tags=self.tags,
-                    source=self.source,
-                    sender=self.sender
-                )
-                if new_id:
-                    self.id = new_id
-                    return True
-                return False
+            fields = dict(
+                profile_id=self.profile_id,
+                timestamp=self.timestamp,
+                category=self.category.value,
+                activity_type=self.activity_type.value,
+                description=self.description,
+                amount=self.amount,
+                unit=self.unit,
+                duration_minutes=self.duration_minutes,
+                notes=self.notes,
+                tags=self.tags,
+                source=self.source,
+                sender=self.sender
+            )
+            if self.id:
+                # Known id - insert or update in a single statement
+                return db.upsert_activity(id=self.id, **fields) is not None
+
+            # New activity - let the database assign the id and skip duplicates
+            new_id = db.create_activity(**fields)
+            if new_id:
+                self.id = new_id
+                return True
+            return False
         except Exception as e:
             logger.error(f"Error saving activity: {e}")
             return False
@@ -317,16 +336,27 @@ class BabyProfile:
         self.gender = gender
         self.birth_weight = birth_weight  # in kg
         self.birth_height = birth_height  # in cm
-        self.id = id or str(uuid.uuid4())
+        self.id = id or _new_id()
+        self._age_cache = None  # (today, birth_date, age_in_days, age_in_months)
+
+    def _get_age(self) -> tuple:
+        """Return the age cache entry, recomputing it at most once per day."""
+        today = date.today()
+        cache = self._age_cache
+        if cache is None or cache[0] != today or cache[1] != self.birth_date:
+            # toordinal() works for both date and datetime birth dates
+            days = today.toordinal() - self.birth_date.toordinal()
+            cache = (today, self.birth_date, days, round(days / 30.44, 1))
+            self._age_cache = cache
+        return cache
 
     def get_age_in_days(self) -> int:
         """Get baby's age in days."""
-        return (datetime.now() - self.birth_date).days
+        return self._get_age()[2]
 
     def get_age_in_months(self) -> float:
         """Get baby's age in months."""
-        days = self.get_age_in_days()
-        return round(days / 30.44, 1)
+        return self._get_age()[3]
 
     @property
     def age_days(self) -> int:
@@ -343,7 +373,7 @@ class BabyProfile:
         return {
             'id': self.id,
             'name': self.name,
-            'birth_date': self.birth_date.isoformat(),
+            'birth_date': self.birth_date,
             'gender': self.gender,
             'birth_weight': self.birth_weight,
             'birth_height': self.birth_height,
@@ -355,7 +385,7 @@ class BabyProfile:
     def from_db_row(cls, row: Dict) -> 'BabyProfile':
         """Create profile from database row."""
         profile = cls(
-            id=str(row['id']),
+            id=row['id'],
             name=row['name'],
             birth_date=row['birth_date'],
             gender=row['gender'],
@@ -369,7 +399,7 @@ class BabyProfile:
         """Save profile to database."""
         try:
             db = get_db_service()
-            logger.info(f"Attempting to save profile: {self.name}, ID: {self.id}")
+            logger.info("Attempting to save profile: %s, ID: %s", self.name, self.id)
 
             # For new profiles (just created), always try to create
             # Don't check existing since we're creating a new one
@@ -384,7 +414,7 @@ class BabyProfile:
                     birth_height=self.birth_height
                 )
                 if new_id:
-                    logger.info(f"Profile created successfully with ID: {new_id}")
+                    logger.info("Profile created successfully with ID: %s", new_id)
                     self.id = new_id
                     self._is_from_db = True
                     return True
@@ -393,7 +423,7 @@ class BabyProfile:
                     return False
             else:
                 # Update existing profile
-                logger.info(f"Updating existing profile with ID: {self.id}")
+                logger.info("Updating existing profile with ID: %s", self.id)
                 result = db.update_profile(
                     self.id,
                     name=self.name,
@@ -402,12 +432,13 @@ class BabyProfile:
                     birth_weight=self.birth_weight,
                     birth_height=self.birth_height
                 )
-                logger.info(f"Profile update result: {result}")
+                logger.info("Profile update result: %s", result)
                 return result
+        except psycopg2.IntegrityError as e:
+            logger.warning(f"Profile rejected by database: {e}")
+            return False
         except Exception as e:
-            logger.error(f"Error saving profile: {e}")
-            import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.exception(f"Error saving profile: {e}")
             return False
 
     def delete(self) -> bool:
@@ -420,7 +451,7 @@ class BabyProfile:
             return False
 
 
-@dataclass
+@dataclass(slots=True)
 class ActivityReminder:
     """Represents an activity reminder with database persistence."""
     reminder_type: ReminderType
@@ -440,7 +471,7 @@ class ActivityReminder:
     def __post_init__(self):
         """Generate unique ID if not provided."""
         if self.id is None:
-            self.id = str(uuid.uuid4())
+            self.id = _new_id()
 
     def to_dict(self) -> Dict:
         """Convert reminder to dictionary."""
@@ -455,9 +486,9 @@ class ActivityReminder:
             'recurrence_hours': self.recurrence_hours,
             'scheduled_time': self.scheduled_time,
             'last_activity_hours': self.last_activity_hours,
-            'last_triggered_at': self.last_triggered_at.isoformat() if self.last_triggered_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'last_triggered_at': self.last_triggered_at,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     @classmethod
@@ -465,10 +496,12 @@ class ActivityReminder:
         """Create reminder from database row."""
         try:
             return cls(
-                id=str(row['id']),
-                profile_id=str(row['profile_id']),
-                reminder_type=ReminderType(row['reminder_type']),
-                activity_category=ActivityCategory(row['activity_category']),
+                id=row['id'],
+                profile_id=row['profile_id'],
+                # Enum(value) is only reached for unknown values, to raise ValueError
+                reminder_type=_REMINDER_MAP.get(row['reminder_type']) or ReminderType(row['reminder_type']),
+                activity_category=(_CATEGORY_MAP.get(row['activity_category'])
+                                   or ActivityCategory(row['activity_category'])),
                 title=row['title'],
                 message=row['message'],
                 enabled=row['enabled'],
@@ -492,37 +525,23 @@ class ActivityReminder:
 
         try:
             db = get_db_service()
-            if self.id and db.get_reminder_by_id(self.id):
-                # Update existing reminder
-                return db.update_reminder(
-                    self.id,
-                    reminder_type=self.reminder_type.value,
-                    activity_category=self.activity_category.value,
-                    title=self.title,
-                    message=self.message,
-                    enabled=self.enabled,
-                    recurrence_hours=self.recurrence_hours,
-                    scheduled_time=self.scheduled_time,
-                    last_activity_hours=self.last_activity_hours,
-                    last_triggered_at=self.last_triggered_at
-                )
-            else:
-                # Create new reminder
-                new_id = db.create_reminder(
-                    profile_id=self.profile_id,
-                    reminder_type=self.reminder_type.value,
-                    activity_category=self.activity_category.value,
-                    title=self.title,
-                    message=self.message,
-                    enabled=self.enabled,
-                    recurrence_hours=self.recurrence_hours,
-                    scheduled_time=self.scheduled_time,
-                    last_activity_hours=self.last_activity_hours
-                )
-                if new_id:
-                    self.id = new_id
-                    return True
-                return False
+            new_id = db.upsert_reminder(
+                id=self.id or _new_id(),
+                profile_id=self.profile_id,
+                reminder_type=self.reminder_type.value,
+                activity_category=self.activity_category.value,
+                title=self.title,
+                message=self.message,
+                enabled=self.enabled,
+                recurrence_hours=self.recurrence_hours,
+                scheduled_time=self.scheduled_time,
+                last_activity_hours=self.last_activity_hours,
+                last_triggered_at=self.last_triggered_at
+            )
+            if new_id:
+                self.id = new_id
+                return True
+            return False
         except Exception as e:
             logger.error(f"Error saving reminder: {e}")
             return False
@@ -540,20 +559,70 @@ class ActivityReminder:
             return False
 
 
+# Columns that update_activity_by_id may write directly
+_ACTIVITY_UPDATABLE_FIELDS = frozenset(BabyActivity.__dataclass_fields__) - {'id', 'profile_id'}
+
+
 class ActivityJournal:
     """Manages collection of baby activities with database persistence."""
 
     def __init__(self):
         self.profile: Optional[BabyProfile] = None
         self.db = get_db_service()
-        self.activities: List[BabyActivity] = []  # Cache for compatibility
+        # Cache for compatibility, indexed by id so mutations are O(1)
+        self._by_id: Dict[str, BabyActivity] = {}
+        self._activities_list: Optional[List[BabyActivity]] = []
+        # Request-scoped results of get_activities_by_date/_by_category
+        self._query_cache: Dict[tuple, List[BabyActivity]] = {}
+        # (name, profile_id) -> (expires_at, result) for aggregate reads; kept
+        # across requests for RESULT_CACHE_TTL and dropped on every write
+        self._result_cache: Dict[tuple, tuple] = {}
+
+    @property
+    def activities(self) -> List[BabyActivity]:
+        """Cached activities in insertion order."""
+        if self._activities_list is None:
+            self._activities_list = list(self._by_id.values())
+        return self._activities_list
+
+    @activities.setter
+    def activities(self, activities: List[BabyActivity]):
+        self._by_id = {activity.id: activity for activity in activities}
+        self._activities_list = None
+        self._query_cache.clear()
+
+    def _cache_activity(self, activity: BabyActivity):
+        """Add or replace an activity in the cache."""
+        self._by_id[activity.id] = activity
+        self._activities_list = None
+        self._query_cache.clear()
+        self._result_cache.clear()
+
+    def clear_cache(self):
+        """Drop memoized query results (call at the end of each request)."""
+        self._query_cache.clear()
+
+    def invalidate_results(self):
+        """Drop cached statistics after writing activities."""
+        self._result_cache.clear()
+
+    def _cached_result(self, name: str, compute):
+        """Return compute() for the current profile, reused for RESULT_CACHE_TTL seconds."""
+        key = (name, self.profile.id)
+        now = time.monotonic()
+        entry = self._result_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        result = compute()
+        self._result_cache[key] = (now + RESULT_CACHE_TTL, result)
+        return result
 
     def set_profile(self, profile: BabyProfile):
         """Set baby profile."""
         self.profile = profile
         try:
             if profile.save():
-                logger.info(f"Profile saved successfully: {profile.name}")
+                logger.info("Profile saved successfully: %s", profile.name)
             else:
                 logger.error("Failed to save profile")
                 raise Exception("Profile save operation returned False - database insert failed")
@@ -573,8 +642,8 @@ class ActivityJournal:
             logger.error(f"Error loading profile: {e}")
             return None
 
-    def add_activity(self, activity: BabyActivity):
-        """Add a new activity to journal."""
+    def _require_profile(self):
+        """Ensure a profile is loaded before writing activities."""
         # Try to reload profile if missing
         if not self.profile:
             logger.warning("Profile not loaded, attempting to reload from database")
@@ -584,37 +653,107 @@ class ActivityJournal:
             logger.error("Cannot add activity without a profile - please create profile first")
             raise Exception("Profile is required to add activities. Please create a baby profile first.")
 
+    def add_activity(self, activity: BabyActivity):
+        """Add a new activity to journal."""
+        self._require_profile()
+
         activity.profile_id = self.profile.id
         if activity.save():
-            logger.info(f"Activity saved successfully: {activity.description}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Activity saved successfully: %s", activity.description)
             # Update cache
-            self.activities.append(activity)
+            self._cache_activity(activity)
             return True
         else:
             logger.error("Failed to save activity")
             raise Exception("Failed to save activity to database")
 
-    def load_activities(self) -> List[BabyActivity]:
-        """Load activities from database."""
+    def add_activities(self, activities: List[BabyActivity]) -> List[BabyActivity]:
+        """Add many activities in a single database round trip.
+
+        IDs are generated client-side so the returned IDs identify which rows
+        were inserted. Duplicates are skipped by the database; returns the
+        activities that were actually inserted.
+        """
+        if not activities:
+            return []
+
+        self._require_profile()
+
+        rows = []
+        for activity in activities:
+            activity.profile_id = self.profile.id
+            rows.append({
+                'id': activity.ensure_id(),
+                'profile_id': activity.profile_id,
+                'timestamp': activity.timestamp,
+                'category': activity.category.value,
+                'activity_type': activity.activity_type.value,
+                'description': activity.description,
+                'amount': activity.amount,
+                'unit': activity.unit,
+                'duration_minutes': activity.duration_minutes,
+                'notes': activity.notes,
+                'tags': activity.tags,
+                'source': activity.source,
+                'sender': activity.sender
+            })
+
+        inserted_ids = set(self.db.create_activities_bulk(rows))
+        saved = [a for a in activities if a.id in inserted_ids]
+
+        logger.info("Bulk saved %d of %d activities", len(saved), len(activities))
+        # Update cache
+        for activity in saved:
+            self._cache_activity(activity)
+        return saved
+
+    def load_activities(self, limit: Optional[int] = None) -> List[BabyActivity]:
+        """Load activities from database (newest first, optionally only the latest ``limit``)."""
         if not self.profile:
             return []
 
         try:
-            activity_rows = self.db.get_activities(self.profile.id)
+            activity_rows = self.db.get_activities(self.profile.id, limit=limit)
             self.activities = [BabyActivity.from_db_row(row) for row in activity_rows]
             return self.activities
         except Exception as e:
             logger.error(f"Error loading activities: {e}")
             return []
 
+    def iter_activities(self, page_size: int = 500) -> Iterator[BabyActivity]:
+        """Stream all activities newest first, one keyset page at a time.
+
+        Does not fill the activity cache, so memory stays bounded by ``page_size``.
+        """
+        if not self.profile:
+            return
+
+        before = None
+        while True:
+            activity_rows = self.db.get_activities_page(self.profile.id, before=before, limit=page_size)
+            for row in activity_rows:
+                yield BabyActivity.from_db_row(row)
+            if len(activity_rows) < page_size:
+                return
+            last = activity_rows[-1]
+            before = (last['timestamp'], last['id'])
+
     def get_activities_by_date(self, date: datetime) -> List[BabyActivity]:
         """Get activities for a specific date."""
         if not self.profile:
             return []
 
+        key = ('date', self.profile.id, date.date())
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
         try:
             activity_rows = self.db.get_activities(self.profile.id, date=date)
-            return [BabyActivity.from_db_row(row) for row in activity_rows]
+            activities = [BabyActivity.from_db_row(row) for row in activity_rows]
+            self._query_cache[key] = activities
+            return list(activities)
         except Exception as e:
             logger.error(f"Error getting activities by date: {e}")
             return []
@@ -624,33 +763,76 @@ class ActivityJournal:
         if not self.profile:
             return []
 
+        key = ('category', self.profile.id, category.value)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
         try:
             activity_rows = self.db.get_activities(self.profile.id, category=category.value)
-            return [BabyActivity.from_db_row(row) for row in activity_rows]
+            activities = [BabyActivity.from_db_row(row) for row in activity_rows]
+            self._query_cache[key] = activities
+            return list(activities)
         except Exception as e:
             logger.error(f"Error getting activities by category: {e}")
             return []
 
-    def get_recent_activities(self, limit: int = 10) -> List[BabyActivity]:
-        """Get most recent activities."""
+    def get_filtered_activities(self, date_from: Optional[datetime] = None,
+                                date_to: Optional[datetime] = None,
+                                category: Optional[str] = None,
+                                activity_type: Optional[str] = None,
+                                limit: int = 500) -> List[BabyActivity]:
+        """Get the newest activities matching all given filters, filtered in SQL."""
         if not self.profile:
             return []
 
         try:
-            activity_rows = self.db.get_activities(self.profile.id, limit=limit)
+            activity_rows = self.db.get_activities(self.profile.id, limit=limit,
+                                                   category=category, activity_type=activity_type,
+                                                   date_from=date_from, date_to=date_to)
+            return [BabyActivity.from_db_row(row) for row in activity_rows]
+        except Exception as e:
+            logger.error(f"Error getting filtered activities: {e}")
+            return []
+
+    def get_recent_activities(self, limit: int = 10,
+                              before_ts: Optional[datetime] = None,
+                              before_id: Optional[str] = None) -> List[BabyActivity]:
+        """Get most recent activities, optionally only those older than ``before_ts``.
+
+        ``before_id`` is the id of the activity at ``before_ts`` on the
+        previous page; activities sharing that timestamp are ordered by id.
+        """
+        if not self.profile:
+            return []
+
+        try:
+            if limit and not before_ts:
+                activity_rows = self.db.get_recent_activities(self.profile.id, limit)
+            else:
+                activity_rows = self.db.get_activities(self.profile.id, limit=limit,
+                                                       before=before_ts, before_id=before_id)
             return [BabyActivity.from_db_row(row) for row in activity_rows]
         except Exception as e:
             logger.error(f"Error getting recent activities: {e}")
             return []
 
     def get_statistics(self) -> Dict:
-        """Get statistics about activities."""
+        """Get statistics about activities.
+
+        The result is shared for RESULT_CACHE_TTL seconds, so callers must
+        treat it as read-only.
+        """
         if not self.profile:
             return {}
 
+        return self._cached_result('statistics', self._load_statistics)
+
+    def _load_statistics(self) -> Dict:
+        """Query statistics from the database, falling back to the activity cache."""
         try:
-            # Try database statistics first
-            db_stats = self.db.get_activity_statistics(self.profile.id)
+            # Try database statistics first (one grouped scan, includes by_type)
+            db_stats = self.db.get_activity_stats_grouped(self.profile.id)
             if db_stats and db_stats.get('total_activities', 0) > 0:
                 logger.info(f"Database statistics successful: {db_stats}")
                 return db_stats
@@ -670,39 +852,27 @@ class ActivityJournal:
 
         logger.info(f"Calculating statistics from {len(self.activities)} loaded activities")
 
+        # Count enum members in C, then map the handful of keys to their values
+        activities = self.activities
+        category_counts = Counter(map(attrgetter('category'), activities))
+        type_counts = Counter(map(attrgetter('activity_type'), activities))
+
         stats = {
-            'total_activities': len(self.activities),
-            'by_category': {},
-            'by_type': {},
+            'total_activities': len(activities),
+            'by_category': {(c.value if c else 'unknown'): n for c, n in category_counts.items()},
+            'by_type': {(t.value if t else 'unknown'): n for t, n in type_counts.items()},
             'daily_averages': {},
             'date_range': {}
         }
 
-        # Count by category and type
-        for activity in self.activities:
-            try:
-                category = activity.category.value if activity.category else 'unknown'
-                activity_type = activity.activity_type.value if activity.activity_type else 'unknown'
-
-                stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-                stats['by_type'][activity_type] = stats['by_type'].get(activity_type, 0) + 1
-            except Exception as e:
-                logger.warning(f"Error processing activity for stats: {e}")
-                continue
-
         # Calculate date range
-        if self.activities:
-            try:
-                timestamps = [a.timestamp for a in self.activities if a.timestamp]
-                if timestamps:
-                    stats['date_range'] = {
-                        'start': min(timestamps).isoformat(),
-                        'end': max(timestamps).isoformat()
-                    }
-            except Exception as e:
-                logger.warning(f"Error calculating date range: {e}")
-
-        logger.info(f"Calculated statistics: {stats}")
+        timestamps = [ts for ts in map(attrgetter('timestamp'), activities) if ts]
+        if timestamps:
+            stats['date_range'] = {
+                'start': min(timestamps).isoformat(),
+                'end': max(timestamps).isoformat()
+            }
+
         return stats
 
     def get_activity_by_id(self, activity_id: str) -> Optional[BabyActivity]:
@@ -719,12 +889,16 @@ class ActivityJournal:
     def delete_activity_by_id(self, activity_id: str) -> bool:
         """Delete activity by ID."""
         try:
-            activity = self.get_activity_by_id(activity_id)
+            # Skip the lookup query when the activity is already cached
+            activity = self._by_id.get(activity_id) or self.get_activity_by_id(activity_id)
             if activity:
                 success = activity.delete()
                 if success:
                     # Update cache
-                    self.activities = [a for a in self.activities if a.id != activity_id]
+                    if self._by_id.pop(activity_id, None) is not None:
+                        self._activities_list = None
+                    self._query_cache.clear()
+                    self._result_cache.clear()
                 return success
             return False
         except Exception as e:
@@ -732,24 +906,28 @@ class ActivityJournal:
             return False
 
     def update_activity_by_id(self, activity_id: str, updates: Dict) -> bool:
-        """Update activity by ID."""
+        """Update activity by ID with a single UPDATE (no re-fetch)."""
         try:
-            activity = self.get_activity_by_id(activity_id)
-            if activity:
-                # Update fields
-                for field, value in updates.items():
-                    if hasattr(activity, field):
-                        setattr(activity, field, value)
-
-                success = activity.save()
-                if success:
-                    # Update cache
-                    for i, cached_activity in enumerate(self.activities):
-                        if cached_activity.id == activity_id:
-                            self.activities[i] = activity
-                            break
-                return success
-            return False
+            db_updates = {}
+            for field, value in updates.items():
+                if field not in _ACTIVITY_UPDATABLE_FIELDS:
+                    continue
+                db_updates[field] = value.value if isinstance(value, Enum) else value
+
+            if not db_updates:
+                # Nothing to write
+                return True
+
+            success = self.db.update_activity(activity_id, **db_updates)
+            if success:
+                self._query_cache.clear()
+                self._result_cache.clear()
+                # Update cache
+                cached_activity = self._by_id.get(activity_id)
+                if cached_activity:
+                    for field in db_updates:
+                        setattr(cached_activity, field, updates[field])
+            return success
         except Exception as e:
             logger.error(f"Error updating activity by ID: {e}")
             return False
@@ -0,0 +1,86 @@
+"""
+Background import jobs for streamed WhatsApp uploads.
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+# Seconds a finished job is kept for a client that never polls its status
+FINISHED_JOB_TTL = 15 * 60
+
+
+class UploadJobs:
+    """Imports uploaded files on a single background worker, in order.
+
+    Each job writes its upload to its own file, so a second upload of an
+    export with the same name cannot truncate a file that is still being
+    imported. The file is removed once the import finishes.
+    """
+
+    def __init__(self, upload_folder: str, chunk_size: int):
+        self.upload_folder = upload_folder
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='upload')
+        self._lock = threading.Lock()
+        # job id -> Future, removed once reported or FINISHED_JOB_TTL after finishing
+        self._jobs: Dict[str, Future] = {}
+        self._finished_at: Dict[str, float] = {}
+
+    def submit(self, stream, filename: str, import_file: Callable[[str], object]) -> str:
+        """Copy ``stream`` to disk and queue ``import_file(path)``; returns the job id."""
+        job_id = uuid.uuid4().hex
+        filepath = os.path.join(self.upload_folder, f"{job_id}_{filename}")
+        with open(filepath, 'xb') as dst:
+            try:
+                shutil.copyfileobj(stream, dst, self.chunk_size)
+            except BaseException:
+                # e.g. the client disconnected mid-upload; don't leave the partial file
+                dst.close()
+                os.remove(filepath)
+                raise
+
+        future = self._executor.submit(self._run, import_file, filepath)
+        with self._lock:
+            self._expire()
+            self._jobs[job_id] = future
+        future.add_done_callback(lambda _: self._mark_finished(job_id))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Future]:
+        """Return the job's Future, or None if it is unknown or has expired."""
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id: str):
+        """Forget a job whose result has been reported."""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._finished_at.pop(job_id, None)
+
+    @staticmethod
+    def _run(import_file, filepath):
+        try:
+            return import_file(filepath)
+        finally:
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+
+    def _mark_finished(self, job_id: str):
+        with self._lock:
+            if job_id in self._jobs:
+                self._finished_at[job_id] = time.monotonic()
+
+    def _expire(self):
+        """Drop finished jobs nobody polled for (call with the lock held)."""
+        cutoff = time.monotonic() - FINISHED_JOB_TTL
+        for job_id in [j for j, t in self._finished_at.items() if t < cutoff]:
+            del self._finished_at[job_id]
+            self._jobs.pop(job_id, None)
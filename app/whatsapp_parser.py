@@ -4,10 +4,113 @@ Parses exported WhatsApp chat messages to extract baby activity information.
 """
 
 import re
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import sys
+from collections import Counter
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import json
 
+# Try different date formats
+_DATE_FORMATS = (
+    '%d/%m/%Y',
+    '%d/%m/%y',
+    '%m/%d/%Y',
+    '%m/%d/%y'
+)
+
+# Parse time with various formats including AM/PM
+_TIME_FORMATS = (
+    '%I:%M:%S %p',  # 12-hour with seconds and AM/PM
+    '%I:%M %p',     # 12-hour with AM/PM
+    '%H:%M:%S',     # 24-hour with seconds
+    '%H:%M'         # 24-hour without seconds
+)
+
+
+# Common header shapes handled without strptime; anything else falls through to it
+_SIMPLE_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})', re.ASCII)
+_SIMPLE_TIME_RE = re.compile(r'(\d{1,2}):(\d{2})(?::(\d{2}))?(?: ([AP]M))?', re.ASCII)
+
+
+def _fast_parse_date(date_str: str) -> Optional[date]:
+    """Parse d/m/y or m/d/y like _DATE_FORMATS, or None to defer to strptime."""
+    match = _SIMPLE_DATE_RE.fullmatch(date_str)
+    if not match:
+        return None
+
+    first, second, year_str = match.groups()
+    year = int(year_str)
+    if len(year_str) == 2:
+        # Same pivot as %y: 69-99 -> 1900s, 00-68 -> 2000s
+        year += 1900 if year >= 69 else 2000
+
+    # Day-first formats are tried before month-first ones
+    for day, month in ((first, second), (second, first)):
+        try:
+            return date(year, int(month), int(day))
+        except ValueError:
+            continue
+    return None
+
+
+def _fast_parse_time(time_str: str) -> Optional[time]:
+    """Parse H:MM[:SS][ AM|PM] like _TIME_FORMATS, or None to defer to strptime."""
+    match = _SIMPLE_TIME_RE.fullmatch(time_str)
+    if not match:
+        return None
+
+    hour_str, minute_str, second_str, period = match.groups()
+    hour = int(hour_str)
+    minute = int(minute_str)
+    second = int(second_str) if second_str else 0
+    if minute > 59 or second > 59:
+        return None
+
+    if period:
+        if not 1 <= hour <= 12:
+            return None
+        hour %= 12
+        if period == 'PM':
+            hour += 12
+    elif hour > 23:
+        return None
+
+    return time(hour, minute, second)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[date]:
+    """Parse a header date string, or None if no format matches.
+
+    Consecutive messages share the same date string, so most calls are cache hits.
+    """
+    parsed = _fast_parse_date(date_str)
+    if parsed is not None:
+        return parsed
+
+    for date_fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, date_fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_time_cached(time_str: str) -> Optional[time]:
+    """Parse a header time string, or None if no format matches."""
+    parsed = _fast_parse_time(time_str)
+    if parsed is not None:
+        return parsed
+
+    for time_fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(time_str, time_fmt).time()
+        except ValueError:
+            continue
+    return None
+
 
 class WhatsAppParser:
     """Parse WhatsApp messages to extract baby activities."""
@@ -53,6 +156,77 @@ class WhatsAppParser:
         }
     }
 
+    # Feeding type rules, checked in order against the lower-cased description;
+    # the first type with a matching substring wins, otherwise FEEDING_TYPE_DEFAULT
+    FEEDING_TYPE_KEYWORDS = (
+        ('extraction', ('extracted', 'pumped', 'pumping', 'expressing', 'expressed milk')),
+        ('breast', ('mummy', 'mother', 'mom', 'mama', 'ma',
+                    'breast', 'bf', 'nursing', 'nursed',
+                    'direct', 'latch')),
+        ('formula', ('powder', 'formula', 'bottle', 'top feed', 'topfeed',
+                     'ebm', 'artificial', 'supplement', 'fortified')),
+        # ml/oz usually means formula or expressed milk
+        ('bottle', ('ml', 'oz')),
+    )
+    FEEDING_TYPE_DEFAULT = 'breast'
+
+    # Flattened (keyword, activity_type, config) entries in ACTIVITY_PATTERNS order
+    _KEYWORD_INDEX = tuple(
+        (keyword, activity_type, config)
+        for activity_type, config in ACTIVITY_PATTERNS.items()
+        for keyword in config['keywords']
+    )
+
+    # Look for patterns like "150 ml", "6 oz", "2.5 hours"; units are tried in the
+    # order they are listed, so the first unit with a match wins
+    _QUANTITY_PATTERNS = {
+        activity_type: tuple(
+            (unit, re.compile(rf'(\d+(?:\.\d+)?)\s*{re.escape(unit)}', re.IGNORECASE))
+            for unit in config['units']
+        )
+        for activity_type, config in ACTIVITY_PATTERNS.items()
+        if 'units' in config
+    }
+
+    # WhatsApp export format variations, matched by one alternation:
+    # [DD/MM/YY, HH:MM:SS AM/PM] Contact: Message
+    # [DD/MM/YYYY, HH:MM:SS] Contact: Message
+    # DD/MM/YY, HH:MM - Contact: Message
+    _MESSAGE_HEADER_RE = re.compile(
+        r'(?:\[(?P<bracket_date>\d{1,2}/\d{1,2}/\d{2,4}),?\s*'
+        r'(?P<bracket_time>\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM)?)\]'
+        r'|(?P<dash_date>\d{1,2}/\d{1,2}/\d{2,4}),?\s*(?P<dash_time>\d{1,2}:\d{2})\s*-)'
+        r'\s*(?P<sender>[^:]+):\s*(?P<text>.+)'
+    )
+
+    # Times mentioned inside a message, e.g. "1:18 pm", "4:45 PM", "1:18pm", "13:30"
+    _TIME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'(\d{1,2}):(\d{2})\s*([ap]m)',  # 1:18 pm, 1:18PM
+        r'(\d{1,2}):(\d{2})(?!\s*[ap]m)',  # 13:30 (24-hour format)
+    ))
+
+    # WhatsApp system message patterns; plain substrings are checked with `in`
+    _META_LITERALS = (
+        # Group management
+        'you created group',
+        'you changed the group name',
+        "you changed this group's icon",
+        'added you',
+        'left the group',
+        'removed from the group',
+        'group description changed',
+
+        # WhatsApp media omitted messages (document/image/video/audio omitted)
+        'omitted',
+
+        # System notifications
+        'messages and calls are end-to-end encrypted',
+        'security code changed',
+        'missed voice call',
+        'missed video call',
+    )
+    _META_REGEX = re.compile(r'https?://|[^a-zA-Z0-9]*$|[0-9\s]*$')
+
     def __init__(self):
         """Initialize the WhatsApp parser."""
         self.messages = []
@@ -68,18 +242,13 @@ class WhatsAppParser:
         Returns:
             List of parsed activities
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Parse individual messages
-        messages = self._extract_messages(content)
-
-        # Extract activities from messages
+        # Parse messages one at a time while streaming the file, extracting activities
         activities = []
-        for msg in messages:
-            activity = self._parse_message_for_activity(msg)
-            if activity:
-                activities.append(activity)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for msg in self._iter_messages(self._iter_lines(f), keep_raw=False):
+                activity = self._parse_message_for_activity(msg)
+                if activity:
+                    activities.append(activity)
 
         self.activities = activities
         return activities
@@ -109,52 +278,62 @@ class WhatsAppParser:
 
     def _extract_messages(self, content: str) -> List[Dict]:
         """Extract individual messages from WhatsApp export."""
-        messages = []
-
-        # WhatsApp export format variations:
-        # [DD/MM/YY, HH:MM:SS AM/PM] Contact: Message
-        # [DD/MM/YYYY, HH:MM:SS] Contact: Message
-        # DD/MM/YY, HH:MM - Contact: Message
-        patterns = [
-            r'\[(\d{1,2}/\d{1,2}/\d{2,4}),?\s*(\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM)?)\]\s*([^:]+):\s*(.+)',
-            r'\[(\d{1,2}/\d{1,2}/\d{2,4}),?\s*(\d{1,2}:\d{2}(?::\d{2})?)\]\s*([^:]+):\s*(.+)',
-            r'(\d{1,2}/\d{1,2}/\d{2,4}),?\s*(\d{1,2}:\d{2})\s*-\s*([^:]+):\s*(.+)'
-        ]
-
-        lines = content.split('\n')
+        return list(self._iter_messages(content.split('\n')))
+
+    @staticmethod
+    def _iter_lines(f) -> Iterator[str]:
+        """Yield lines of an open file without newlines, as content.split('\\n') would."""
+        line = ''
+        for line in f:
+            yield line.rstrip('\n')
+        # split('\n') yields a trailing empty string after a final newline
+        if not line or line.endswith('\n'):
+            yield ''
+
+    def _iter_messages(self, lines: Iterable[str], keep_raw: bool = True) -> Iterator[Dict]:
+        """Yield each message as soon as the header of the next one is seen.
+
+        With keep_raw=False the 'raw' field is left out; activity extraction never reads it.
+        """
         current_msg = None
+        # Continuation lines of current_msg, joined once when the message is complete
+        continuation = None
 
         for line in lines:
-            matched = False
-            for pattern in patterns:
-                match = re.match(pattern, line)
-                if match:
-                    if current_msg:
-                        messages.append(current_msg)
-
-                    date_str = match.group(1)
-                    time_str = match.group(2)
-                    sender = match.group(3).strip()
-                    text = match.group(4).strip()
-
-                    current_msg = {
-                        'datetime': self._parse_datetime(date_str, time_str),
-                        'sender': sender,
-                        'text': text,
-                        'raw': line
-                    }
-                    matched = True
-                    break
-
-            if not matched and current_msg:
+            match = self._MESSAGE_HEADER_RE.match(line)
+            if match:
+                if current_msg:
+                    if continuation:
+                        self._join_continuation(current_msg, continuation)
+                        continuation = None
+                    yield current_msg
+
+                current_msg = {
+                    'datetime': self._parse_datetime(*self._header_date_time(match)),
+                    # A chat has only a handful of senders; share one string per sender
+                    'sender': sys.intern(match['sender'].strip()),
+                    'text': match['text'].strip()
+                }
+                if keep_raw:
+                    current_msg['raw'] = line
+            elif current_msg:
                 # Continuation of previous message
-                current_msg['text'] += ' ' + line.strip()
-                current_msg['raw'] += '\n' + line
+                if continuation is None:
+                    continuation = [line]
+                else:
+                    continuation.append(line)
 
         if current_msg:
-            messages.append(current_msg)
+            if continuation:
+                self._join_continuation(current_msg, continuation)
+            yield current_msg
 
-        return messages
+    @staticmethod
+    def _join_continuation(msg: Dict, continuation: List[str]):
+        """Append continuation lines to a message's text (and raw, when kept)."""
+        msg['text'] = ' '.join([msg['text'], *(line.strip() for line in continuation)])
+        if 'raw' in msg:
+            msg['raw'] = '\n'.join([msg['raw'], *continuation])
 
     def _parse_single_message(self, message: str) -> Optional[Dict]:
         """Parse a single message string."""
@@ -166,26 +345,14 @@ class WhatsAppParser:
         if not message:
             return None
 
-        patterns = [
-            r'\[(\d{1,2}/\d{1,2}/\d{2,4}),?\s*(\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM)?)\]\s*([^:]+):\s*(.+)',
-            r'\[(\d{1,2}/\d{1,2}/\d{2,4}),?\s*(\d{1,2}:\d{2}(?::\d{2})?)\]\s*([^:]+):\s*(.+)',
-            r'(\d{1,2}/\d{1,2}/\d{2,4}),?\s*(\d{1,2}:\d{2})\s*-\s*([^:]+):\s*(.+)'
-        ]
-
-        for pattern in patterns:
-            match = re.match(pattern, message)
-            if match:
-                date_str = match.group(1)
-                time_str = match.group(2)
-                sender = match.group(3).strip()
-                text = match.group(4).strip()
-
-                return {
-                    'datetime': self._parse_datetime(date_str, time_str),
-                    'sender': sender,
-                    'text': text,
-                    'raw': message
-                }
+        match = self._MESSAGE_HEADER_RE.match(message)
+        if match:
+            return {
+                'datetime': self._parse_datetime(*self._header_date_time(match)),
+                'sender': match['sender'].strip(),
+                'text': match['text'].strip(),
+                'raw': message
+            }
 
         # If no timestamp, treat as plain message
         return {
@@ -195,139 +362,86 @@ class WhatsAppParser:
             'raw': message
         }
 
+    @staticmethod
+    def _header_date_time(match: re.Match) -> Tuple[str, str]:
+        """Return the (date, time) strings from whichever header branch matched."""
+        if match['bracket_date'] is not None:
+            return match['bracket_date'], match['bracket_time']
+        return match['dash_date'], match['dash_time']
+
     def _parse_datetime(self, date_str: str, time_str: str) -> datetime:
         """Parse date and time strings to datetime object."""
-        # Clean up time string
-        time_str = time_str.strip()
-
-        # Try different date formats
-        date_formats = [
-            '%d/%m/%Y',
-            '%d/%m/%y',
-            '%m/%d/%Y',
-            '%m/%d/%y'
-        ]
-
-        for date_fmt in date_formats:
-            try:
-                date_part = datetime.strptime(date_str, date_fmt).date()
-                break
-            except ValueError:
-                continue
-        else:
+        date_part = _parse_date_cached(date_str)
+        if date_part is None:
             date_part = datetime.now().date()
 
-        # Parse time with various formats including AM/PM
-        time_formats = [
-            '%I:%M:%S %p',  # 12-hour with seconds and AM/PM
-            '%I:%M %p',     # 12-hour with AM/PM
-            '%H:%M:%S',     # 24-hour with seconds
-            '%H:%M'         # 24-hour without seconds
-        ]
-
-        for time_fmt in time_formats:
-            try:
-                time_part = datetime.strptime(time_str, time_fmt).time()
-                break
-            except ValueError:
-                continue
-        else:
+        time_part = _parse_time_cached(time_str.strip())
+        if time_part is None:
             time_part = datetime.now().time()
 
         return datetime.combine(date_part, time_part)
 
-    def _is_whatsapp_meta_message(self, text: str) -> bool:
-        """Check if message is a WhatsApp system/meta message that should be ignored."""
-        text_lower = text.lower()
-
-        # WhatsApp system message patterns
-        meta_patterns = [
-            # Group management
-            r'you created group',
-            r'you changed the group name',
-            r'you changed this group\'s icon',
-            r'added you',
-            r'left the group',
-            r'removed from the group',
-            r'group description changed',
-
-            # Media and links that aren't baby related
-            r'^https?://',  # URLs by themselves
-            r'omitted',     # WhatsApp media omitted messages
-            r'document omitted',
-            r'image omitted',
-            r'video omitted',
-            r'audio omitted',
-
-            # System notifications
-            r'messages and calls are end-to-end encrypted',
-            r'security code changed',
-            r'missed voice call',
-            r'missed video call',
-
-            # Empty or very short messages that aren't meaningful
-            r'^[^a-zA-Z0-9]*$',  # Only symbols/punctuation
-            r'^[0-9\s]*$',       # Only numbers and spaces
-        ]
-
-        for pattern in meta_patterns:
-            if re.search(pattern, text_lower):
-                return True
+    def _is_whatsapp_meta_message(self, text_lower: str) -> bool:
+        """Check if already lower-cased message text is a WhatsApp system/meta message."""
+        # Very short messages without baby activity keywords
+        if len(text_lower.strip()) < 5:
+            return True
 
-        # Additional check for very short messages without baby activity keywords
-        if len(text.strip()) < 5:  # Very short messages
+        # URLs by themselves, only symbols/punctuation, or only numbers and spaces
+        if self._META_REGEX.match(text_lower):
             return True
 
+        for literal in self._META_LITERALS:
+            if literal in text_lower:
+                return True
+
         return False
 
     def _parse_message_for_activity(self, msg_data: Dict) -> Optional[Dict]:
         """Extract activity information from a parsed message."""
-        text = msg_data['text'].lower()
         original_text = msg_data['text']
+        text = original_text.lower()
 
         # Filter out WhatsApp meta-messages and system notifications
-        if self._is_whatsapp_meta_message(original_text):
+        if self._is_whatsapp_meta_message(text):
             return None
 
-        for activity_type, config in self.ACTIVITY_PATTERNS.items():
-            for keyword in config['keywords']:
-                if keyword in text:
-                    # Check for time in the message content (e.g., "1:18 pm", "4:45 pm")
-                    actual_timestamp = self._extract_time_from_message(original_text, msg_data['datetime'])
-
-                    activity = {
-                        'timestamp': actual_timestamp.isoformat(),
-                        'type': activity_type,
-                        'category': config['category'],
-                        'sender': msg_data['sender'],
-                        'original_message': msg_data['text'],
-                        'details': {}
-                    }
-
-                    # Special handling for feeding to determine breast vs formula
-                    if activity_type == 'feeding':
-                        activity['subtype'] = self._determine_feeding_type(text)
-
-                    # Extract quantities if applicable
-                    if 'units' in config:
-                        quantity = self._extract_quantity(text, config['units'])
-                        if quantity:
-                            activity['details']['amount'] = quantity['value']
-                            activity['details']['unit'] = quantity['unit']
-
-                    # Extract additional context
-                    activity['details']['notes'] = self._extract_notes(text, keyword)
-
-                    return activity
+        for keyword, activity_type, config in self._KEYWORD_INDEX:
+            if keyword in text:
+                # Check for time in the message content (e.g., "1:18 pm", "4:45 pm")
+                actual_timestamp = self._extract_time_from_message(original_text, msg_data['datetime'])
+
+                activity = {
+                    'timestamp': actual_timestamp.isoformat(),
+                    'type': activity_type,
+                    'category': config['category'],
+                    'sender': msg_data['sender'],
+                    'original_message': msg_data['text'],
+                    'details': {}
+                }
+
+                # Special handling for feeding to determine breast vs formula
+                if activity_type == 'feeding':
+                    activity['subtype'] = self._feeding_type_from_lower(text)
+
+                # Extract quantities if applicable
+                if 'units' in config:
+                    quantity = self._extract_quantity(text, self._QUANTITY_PATTERNS[activity_type])
+                    if quantity:
+                        activity['details']['amount'] = quantity['value']
+                        activity['details']['unit'] = quantity['unit']
+
+                # Extract additional context
+                activity['details']['notes'] = self._extract_notes(text, keyword)
+
+                return activity
 
         return None
 
-    def _extract_quantity(self, text: str, units: List[str]) -> Optional[Dict]:
+    def _extract_quantity(self, text: str, unit_patterns: Tuple[Tuple[str, re.Pattern], ...]) -> Optional[Dict]:
         """Extract numerical quantities with units from text."""
-        for unit in units:
-            # Look for patterns like "150 ml", "6 oz", "2.5 hours"
-            pattern = rf'(\d+(?:\.\d+)?)\s*{re.escape(unit)}'
-            match = re.search(pattern, text, re.IGNORECASE)
+        for unit, pattern in unit_patterns:
+            match = pattern.search(text)
             if match:
                 return {
                     'value': float(match.group(1)),
@@ -337,29 +451,26 @@ class WhatsAppParser:
         return None
 
     def _extract_notes(self, text: str, keyword: str) -> str:
-        """Extract contextual notes around the activity keyword."""
-        # Find sentence containing the keyword
-        sentences = text.split('.')
-        for sentence in sentences:
-            if keyword in sentence.lower():
-                return sentence.strip()
+        """Extract contextual notes around the activity keyword (text is already lower-cased)."""
+        # Find sentence containing the keyword. Keywords never contain '.', so this
+        # is the sentence around its first occurrence; slice it out rather than split
+        index = text.find(keyword)
+        if index >= 0:
+            start = text.rfind('.', 0, index) + 1
+            end = text.find('.', index)
+            return text[start:end if end >= 0 else len(text)].strip()
 
         # If no sentence found, return first 100 chars
         return text[:100].strip()
 
     def _extract_time_from_message(self, text: str, default_datetime: datetime) -> datetime:
         """Extract time mentioned in the message and use it instead of message timestamp."""
-        import re
+        # Every time pattern needs a colon; most messages have none
+        if ':' not in text:
+            return default_datetime
 
-        # Look for time patterns like "1:18 pm", "4:45 PM", "13:30", "1:18pm"
-        time_patterns = [
-            r'(\d{1,2}):(\d{2})\s*([ap]m)',  # 1:18 pm or 1:18pm
-            r'(\d{1,2}):(\d{2})\s*([AP]M)',  # 1:18 PM or 1:18PM
-            r'(\d{1,2}):(\d{2})(?!\s*[ap]m)',  # 13:30 (24-hour format)
-        ]
-
-        for pattern in time_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self._TIME_PATTERNS:
+            match = pattern.search(text)
             if match:
                 hour = int(match.group(1))
                 minute = int(match.group(2))
@@ -401,43 +512,17 @@ class WhatsAppParser:
 
     def _determine_feeding_type(self, text: str) -> str:
         """Determine if feeding is breast milk or formula/bottle based on keywords."""
-        text_lower = text.lower()
-
-        # Check for extraction keywords first
-        extraction_keywords = ['extracted', 'pumped', 'pumping', 'expressing', 'expressed milk']
-        for keyword in extraction_keywords:
-            if keyword in text_lower:
-                return 'extraction'
-
-        # Keywords for breast feeding
-        breast_keywords = [
-            'mummy', 'mother', 'mom', 'mama', 'ma',
-            'breast', 'bf', 'nursing', 'nursed',
-            'direct', 'latch'
-        ]
-
-        # Keywords for formula/bottle feeding
-        formula_keywords = [
-            'powder', 'formula', 'bottle', 'top feed', 'topfeed',
-            'ebm', 'artificial', 'supplement', 'fortified'
-        ]
-
-        # Check for breast feeding indicators
-        for keyword in breast_keywords:
-            if keyword in text_lower:
-                return 'breast'
-
-        # Check for formula feeding indicators
-        for keyword in formula_keywords:
-            if keyword in text_lower:
-                return 'formula'
-
-        # Default to bottle if ml/oz is mentioned (usually formula/expressed)
-        if 'ml' in text_lower or 'oz' in text_lower:
-            return 'bottle'
+        return self._feeding_type_from_lower(text.lower())
+
+    def _feeding_type_from_lower(self, text_lower: str) -> str:
+        """Feeding type classification for text that is already lower-cased."""
+        for feeding_type, keywords in self.FEEDING_TYPE_KEYWORDS:
+            for keyword in keywords:
+                if keyword in text_lower:
+                    return feeding_type
 
         # Default to breast feeding if no specific type mentioned
-        return 'breast'
+        return self.FEEDING_TYPE_DEFAULT
 
     def export_to_json(self, output_path: str):
         """Export parsed activities to JSON file."""
@@ -455,18 +540,14 @@ class WhatsAppParser:
 
         if self.activities:
             # Count by type and category
-            for activity in self.activities:
-                act_type = activity['type']
-                category = activity['category']
-
-                summary['by_type'][act_type] = summary['by_type'].get(act_type, 0) + 1
-                summary['by_category'][category] = summary['by_category'].get(category, 0) + 1
+            summary['by_type'] = dict(Counter(a['type'] for a in self.activities))
+            summary['by_category'] = dict(Counter(a['category'] for a in self.activities))
 
-            # Get date range
-            dates = [datetime.fromisoformat(a['timestamp']) for a in self.activities]
+            # Get date range; ISO-8601 timestamps sort lexicographically
+            stamps = [a['timestamp'] for a in self.activities]
             summary['date_range'] = {
-                'start': min(dates).isoformat(),
-                'end': max(dates).isoformat()
+                'start': min(stamps),
+                'end': max(stamps)
             }
 
         return summary
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for the Baby Activity Journal (picked up automatically
+when gunicorn is started from the project root).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+
+# One process serving requests from a thread pool. The journal keeps
+# per-process caches of activities, so extra worker processes would each
+# hold their own copy and could serve stale data after another worker's
+# write; raise WEB_CONCURRENCY only with that in mind.
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Not preloaded: main_db opens its database connection pool at import time,
+# and those connections must not be shared between forked workers.
+preload_app = False
@@ -8,9 +8,12 @@ Testing deployment timeout issue.
 """
 
 import os
-from flask import Flask, render_template, request, redirect, url_for, jsonify, flash
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Request, render_template, request, redirect, url_for, jsonify, flash
 from flask_cors import CORS
 from datetime import datetime, timedelta
+from operator import itemgetter
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 import logging
@@ -24,12 +27,30 @@ from app.activity_processor import ActivityProcessor
 from app.whatsapp_parser import WhatsAppParser
 from app.insights_generator import InsightsGenerator
 from app.database import get_db_service
+from app.json_provider import OrjsonProvider
+from app.upload_jobs import UploadJobs
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class UploadRequest(Request):
+    """Request that spools multipart uploads to disk past STREAM_CHUNK_SIZE.
+
+    Werkzeug keeps files up to 500KB in memory; spilling to the upload folder
+    sooner keeps memory flat however large the chat export is.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None,
+                         content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=STREAM_CHUNK_SIZE, mode='w+b',
+                                             dir=app.config['UPLOAD_FOLDER'])
+
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+app.json = OrjsonProvider(app)
 
 # Configure CORS for Next.js frontend
 CORS(app, origins=[
@@ -41,12 +62,17 @@ app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
 
+# Chunk size for copying uploads to disk
+STREAM_CHUNK_SIZE = 64 * 1024
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Initialize journal and processor
 journal = ActivityJournal()
 processor = ActivityProcessor()
+# Shared for feeding-type classification, which keeps no per-call state
+feeding_parser = WhatsAppParser()
 
 # Load existing data on startup
 try:
@@ -57,6 +83,17 @@ except Exception as e:
     logger.error(f"Error loading data from database: {e}")
 
 
+def _format_display_timestamp(iso_timestamp):
+    """Turn an ISO timestamp from to_dict() into 'YYYY-MM-DD HH:MM' by slicing."""
+    return iso_timestamp[:10] + ' ' + iso_timestamp[11:16]
+
+
+@app.teardown_request
+def clear_journal_query_cache(exc):
+    """Memoized journal queries only live for one request."""
+    journal.clear_cache()
+
+
 @app.context_processor
 def inject_profile():
     """Make profile available to all templates."""
@@ -70,10 +107,6 @@ def index():
     if not journal.profile:
         journal.load_profile()
 
-    # Load fresh activities from database
-    if journal.profile:
-        journal.load_activities()
-
     recent_activities = journal.get_recent_activities(limit=10)
     stats = journal.get_statistics()
 
@@ -81,7 +114,7 @@ def index():
     activities_display = []
     for activity in recent_activities:
         act_dict = activity.to_dict()
-        act_dict['timestamp_formatted'] = datetime.fromisoformat(act_dict['timestamp']).strftime('%Y-%m-%d %H:%M')
+        act_dict['timestamp_formatted'] = _format_display_timestamp(act_dict['timestamp'])
         activities_display.append(act_dict)
 
     # Check if profile exists for user guidance
@@ -119,9 +152,8 @@ def setup():
                 # Verify profile was actually saved to database
                 journal.load_profile()
 
-                # Load activities into cache for immediate availability
-                if journal.profile:
-                    journal.load_activities()
+                # A new profile starts without activities
+                journal.activities = []
 
                 if journal.profile and journal.profile.id:
                     # Double-check by querying database directly
@@ -149,6 +181,45 @@ def setup():
     return render_template('setup.html', profile=journal.profile)
 
 
+def _import_whatsapp_file(filepath):
+    """Parse a saved WhatsApp export and save its activities.
+
+    Returns ``(processed, saved)``, or None when there is no profile to save to.
+    """
+    activities = processor.process_whatsapp_file(filepath)
+
+    if not journal.profile:
+        return None
+
+    # Insert in one batch; the database skips duplicates
+    return len(activities), len(journal.add_activities(activities))
+
+
+def _flash_import_summary(result):
+    """Flash the outcome of _import_whatsapp_file()."""
+    if result is None:
+        flash('No activities were saved. Please check if you have created a baby profile first.', 'warning')
+        return
+
+    total_processed, saved_count = result
+    duplicate_count = total_processed - saved_count
+
+    # Provide detailed feedback
+    if saved_count > 0:
+        message = f'Successfully processed {total_processed} activities: {saved_count} new'
+        if duplicate_count > 0:
+            message += f', {duplicate_count} duplicates skipped'
+        flash(message, 'success')
+    elif duplicate_count > 0:
+        flash(f'Processed {total_processed} activities: {duplicate_count} were duplicates (skipped)', 'info')
+    else:
+        flash('No activities were saved. Please check if you have created a baby profile first.', 'warning')
+
+
+# Streamed uploads are imported here so the request returns straight away
+upload_jobs = UploadJobs(app.config['UPLOAD_FOLDER'], STREAM_CHUNK_SIZE)
+
+
 @app.route('/upload', methods=['GET', 'POST'])
 def upload_whatsapp():
     """Upload and process WhatsApp chat export."""
@@ -165,55 +236,11 @@ def upload_whatsapp():
         if file and file.filename.endswith('.txt'):
             filename = secure_filename(file.filename)
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
+            file.save(filepath, STREAM_CHUNK_SIZE)
 
             try:
                 # Process the WhatsApp file
-                activities = processor.process_whatsapp_file(filepath)
-
-                # Add activities to journal
-                saved_count = 0
-                duplicate_count = 0
-                error_count = 0
-
-                for activity in activities:
-                    try:
-                        # Try to save the activity
-                        if journal.add_activity(activity):
-                            saved_count += 1
-                        else:
-                            # Check if it was a duplicate by trying to find it in database
-                            db = get_db_service()
-                            existing = db.get_activities(
-                                journal.profile.id,
-                                limit=1
-                            )
-                            # Simple heuristic: if we have activities in DB, likely a duplicate
-                            if existing:
-                                duplicate_count += 1
-                            else:
-                                error_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to save activity: {e}")
-                        error_count += 1
-
-                # Reload activities from database to update display
-                journal.load_activities()
-
-                # Provide detailed feedback
-                total_processed = len(activities)
-                if saved_count > 0:
-                    message = f'Successfully processed {total_processed} activities: {saved_count} new'
-                    if duplicate_count > 0:
-                        message += f', {duplicate_count} duplicates skipped'
-                    if error_count > 0:
-                        message += f', {error_count} errors'
-                    flash(message, 'success')
-                elif duplicate_count > 0:
-                    flash(f'Processed {total_processed} activities: {duplicate_count} were duplicates (skipped)', 'info')
-                else:
-                    flash('No activities were saved. Please check if you have created a baby profile first.', 'warning')
-
+                _flash_import_summary(_import_whatsapp_file(filepath))
                 return redirect(url_for('index'))
 
             except Exception as e:
@@ -221,7 +248,68 @@ def upload_whatsapp():
                 flash(f'Error processing file: {str(e)}', 'error')
                 return redirect(request.url)
 
-    return render_template('upload.html')
+    return render_template('upload.html', stream_upload_url=url_for('upload_whatsapp_stream'))
+
+
+@app.route('/upload_stream', methods=['POST', 'PUT'])
+def upload_whatsapp_stream():
+    """Upload a WhatsApp export sent as the raw request body.
+
+    The body is copied to disk in 64KB chunks instead of going through the
+    multipart form parser, so memory use does not grow with the file. The
+    file name comes from the ``filename`` query parameter. The import runs in
+    the background; the 202 response points at /api/upload_status for the
+    result.
+    """
+    if request.mimetype == 'multipart/form-data':
+        return upload_whatsapp()
+
+    filename = secure_filename(request.args.get('filename', ''))
+    if not filename.endswith('.txt'):
+        return jsonify({
+            'success': False,
+            'message': 'A .txt WhatsApp export is required'
+        }), 400
+
+    job_id = upload_jobs.submit(request.stream, filename, _import_whatsapp_file)
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('api_upload_status', job_id=job_id)
+    }), 202
+
+
+@app.route('/api/upload_status/<job_id>')
+def api_upload_status(job_id):
+    """API endpoint to poll a streamed upload's import job."""
+    future = upload_jobs.get(job_id)
+    if future is None:
+        return jsonify({
+            'success': False,
+            'message': 'Upload job not found'
+        }), 404
+
+    if not future.done():
+        return jsonify({'state': 'pending'})
+
+    upload_jobs.discard(job_id)
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Error processing WhatsApp file: {error}")
+        flash(f'Error processing file: {str(error)}', 'error')
+        return jsonify({
+            'state': 'error',
+            'success': False,
+            'message': f'Error processing file: {str(error)}',
+            'redirect': url_for('upload_whatsapp')
+        })
+
+    _flash_import_summary(future.result())
+    return jsonify({
+        'state': 'done',
+        'success': True,
+        'redirect': url_for('index')
+    })
 
 
 @app.route('/quick_add', methods=['GET', 'POST'])
@@ -252,9 +340,6 @@ def quick_add():
                     journal.add_activity(activity)
                     flash('Activity added (uncategorized)', 'info')
 
-                # Reload activities to update display
-                journal.load_activities()
-
             except Exception as e:
                 logger.error(f"Error adding activity: {e}")
                 flash(f'Error adding activity: {str(e)}', 'error')
@@ -273,47 +358,27 @@ def activities():
     category_filter = request.args.get('category')
     activity_type_filter = request.args.get('activity_type')
 
-    # Start with all recent activities
-    filtered_activities = journal.get_recent_activities(limit=500)
-
-    # Apply date range filter
-    if date_from:
-        from_date = datetime.strptime(date_from, '%Y-%m-%d')
-        filtered_activities = [a for a in filtered_activities
-                             if a.timestamp >= from_date.replace(hour=0, minute=0, second=0)]
-
-    if date_to:
-        to_date = datetime.strptime(date_to, '%Y-%m-%d')
-        filtered_activities = [a for a in filtered_activities
-                             if a.timestamp <= to_date.replace(hour=23, minute=59, second=59)]
-
-    # Apply category filter
-    if category_filter:
-        filtered_activities = [a for a in filtered_activities
-                             if a.category.value == category_filter]
-
-    # Apply activity type filter
-    if activity_type_filter:
-        filtered_activities = [a for a in filtered_activities
-                             if a.activity_type.value == activity_type_filter]
-
-    # Sort by timestamp (newest first)
-    filtered_activities = sorted(filtered_activities, key=lambda x: x.timestamp, reverse=True)
+    # Filter and sort in the database (newest first)
+    from_date = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+    to_date = datetime.strptime(date_to, '%Y-%m-%d').replace(hour=23, minute=59, second=59) if date_to else None
+    filtered_activities = journal.get_filtered_activities(date_from=from_date,
+                                                          date_to=to_date,
+                                                          category=category_filter or None,
+                                                          activity_type=activity_type_filter or None,
+                                                          limit=500)
 
     # Format for display
     activities_display = []
     for activity in filtered_activities:
         act_dict = activity.to_dict()
-        act_dict['timestamp_formatted'] = datetime.fromisoformat(act_dict['timestamp']).strftime('%Y-%m-%d %H:%M')
+        act_dict['timestamp_formatted'] = _format_display_timestamp(act_dict['timestamp'])
         activities_display.append(act_dict)
 
     # Get categories and activity types for filter dropdowns
     categories = [cat.value for cat in ActivityCategory]
 
-    # Get unique activity types from all activities
-    all_activities = journal.get_recent_activities(limit=500)
-    activity_types = list(set(a.activity_type.value for a in all_activities))
-    activity_types.sort()
+    # Every valid type comes from the enum, so no query is needed
+    activity_types = sorted(atype.value for atype in ActivityType)
 
     return render_template('activities.html',
                          activities=activities_display,
@@ -345,63 +410,21 @@ def analytics():
         from app.database import get_db_service
         db = get_db_service()
 
-        # Query feeding activities directly
-        feeding_rows = db.get_activities(journal.profile.id, category='feeding')
-        logger.info(f"Found {len(feeding_rows)} feeding activities in database")
+        # Aggregate feeding metrics in the database rather than fetching every row
+        feeding_metrics = db.get_feeding_metrics(journal.profile.id,
+                                                 WhatsAppParser.FEEDING_TYPE_KEYWORDS,
+                                                 WhatsAppParser.FEEDING_TYPE_DEFAULT)
+        logger.info(f"Found {feeding_metrics['total_feeds']} feeding activities in database")
 
-        if not feeding_rows:
+        if not feeding_metrics['total_feeds']:
             return render_template('analytics_simple.html', error="No feeding activities found. Add some feeding activities first.")
 
-        # Process feeding data for chart and calculate metrics
-        feeding_data = []
-        breast_feeds = 0
-        total_amount = 0
-        valid_amounts = []
-        dates_set = set()
-
-        # Import feeding type classifier
-        from app.whatsapp_parser import WhatsAppParser
-        parser = WhatsAppParser()
-
-        for row in feeding_rows:
-            try:
-                # Convert amount to float, ensure it's a number
-                amount = 0
-                if row['amount'] is not None:
-                    amount = float(row['amount']) if row['amount'] != '' else 0
-
-                # Classify feeding type
-                feeding_type = parser._determine_feeding_type(row['description'] or '')
-                if feeding_type == 'breast':
-                    breast_feeds += 1
-
-                feeding_record = {
-                    'id': str(row['id']),  # Add activity ID for editing
-                    'date': row['timestamp'].strftime('%Y-%m-%d'),
-                    'time': row['timestamp'].strftime('%H:%M'),
-                    'amount': amount,
-                    'description': row['description'],
-                    'feeding_type': feeding_type
-                }
-                feeding_data.append(feeding_record)
-
-                # Collect data for metrics
-                if amount > 0:
-                    total_amount += amount
-                    valid_amounts.append(amount)
-                dates_set.add(feeding_record['date'])
-
-            except Exception as e:
-                logger.warning(f"Error processing feeding row: {e}")
-                continue
-
-        # Sort by timestamp
-        feeding_data.sort(key=lambda x: x['date'] + ' ' + x['time'])
-
         # Calculate metrics
-        total_feeds = len(feeding_data)
-        days_tracked = len(dates_set)
-        avg_amount = sum(valid_amounts) / len(valid_amounts) if valid_amounts else 0
+        total_feeds = feeding_metrics['total_feeds']
+        days_tracked = feeding_metrics['days_tracked']
+        total_amount = feeding_metrics['total_amount']
+        avg_amount = feeding_metrics['avg_amount']
+        breast_feeds = feeding_metrics['by_type'].get('breast', 0)
         daily_avg_amount = total_amount / days_tracked if days_tracked > 0 else 0  # ml per day
         frequency = total_feeds / days_tracked if days_tracked > 0 else 0  # feeds per day
         weekly_avg_amount = total_amount / (days_tracked / 7) if days_tracked > 0 else 0  # ml per week
@@ -418,10 +441,24 @@ def analytics():
             'total_amount': round(total_amount, 1)
         }
 
-        logger.info(f"Processed {len(feeding_data)} feeding records")
+        # The chart only needs per-day totals, and the table the latest feedings
+        daily_totals = db.get_feeding_daily_totals(journal.profile.id)
+
+        recent_feeds = []
+        for row in db.get_activities(journal.profile.id, category='feeding', limit=10):
+            recent_feeds.append({
+                'id': str(row['id']),  # Add activity ID for editing
+                'date': row['timestamp'].strftime('%Y-%m-%d'),
+                'time': row['timestamp'].strftime('%H:%M'),
+                'amount': float(row['amount']) if row['amount'] is not None else 0,
+                'description': row['description'],
+                'feeding_type': feeding_parser._determine_feeding_type(row['description'] or '')
+            })
+
         logger.info(f"Calculated metrics: {metrics}")
 
-        return render_template('analytics_simple.html', feeding_data=feeding_data, metrics=metrics)
+        return render_template('analytics_simple.html', recent_feeds=recent_feeds,
+                               daily_totals=daily_totals, metrics=metrics)
 
     except Exception as e:
         logger.error(f"Error in simple analytics: {e}")
@@ -430,6 +467,10 @@ def analytics():
         return render_template('analytics_simple.html', error=f"Error loading analytics: {str(e)}")
 
 
+# Runs the independent /debug queries side by side, each on its own pooled connection
+_debug_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='debug')
+
+
 @app.route('/debug')
 def debug_dashboard():
     """Debug dashboard to show database connectivity and data status."""
@@ -441,6 +482,7 @@ def debug_dashboard():
             'sample_activities': [],
             'errors': []
         }
+        profile_data = None
 
         # Test database connectivity
         try:
@@ -466,88 +508,55 @@ def debug_dashboard():
         except Exception as e:
             debug_info['errors'].append(f"Profile query error: {e}")
 
-        # Get activity summary
-        try:
-            if profile_data:
-                activities = db.get_activities(profile_data['id'], limit=100)
+        if profile_data:
+            # Both only need the profile id, so run them concurrently
+            stats_query = _debug_executor.submit(db.get_activity_statistics, profile_data['id'])
+            recent_query = _debug_executor.submit(db.get_recent_activities, profile_data['id'], 10)
+
+            # Get activity summary
+            try:
+                # Counts and date range are aggregated by the database
+                stats = stats_query.result()
                 debug_info['activity_summary'] = {
-                    'total_count': len(activities),
-                    'categories': {},
+                    'total_count': stats.get('total_activities', 0),
+                    'categories': stats.get('by_category', {}),
                     'date_range': {}
                 }
+                if stats.get('date_range'):
+                    debug_info['activity_summary']['date_range'] = {
+                        'earliest': stats['date_range']['start'],
+                        'latest': stats['date_range']['end']
+                    }
+            except Exception as e:
+                debug_info['errors'].append(f"Activity query error: {e}")
 
-                if activities:
-                    # Category breakdown
-                    for activity in activities:
-                        cat = activity.get('category', 'unknown')
-                        debug_info['activity_summary']['categories'][cat] = debug_info['activity_summary']['categories'].get(cat, 0) + 1
-
-                    # Date range
-                    timestamps = [a['timestamp'] for a in activities if a.get('timestamp')]
-                    if timestamps:
-                        debug_info['activity_summary']['date_range'] = {
-                            'earliest': str(min(timestamps)),
-                            'latest': str(max(timestamps))
-                        }
-
-                    # Sample activities (first 5)
-                    debug_info['sample_activities'] = [
-                        {
-                            'id': a.get('id', 'N/A'),
-                            'timestamp': str(a.get('timestamp', 'N/A')),
-                            'category': a.get('category', 'N/A'),
-                            'activity_type': a.get('activity_type', 'N/A'),
-                            'description': a.get('description', 'N/A')[:100],
-                            'amount': a.get('amount'),
-                            'unit': a.get('unit')
-                        }
-                        for a in activities[:5]
-                    ]
-        except Exception as e:
-            debug_info['errors'].append(f"Activity query error: {e}")
-
-        # Test journal loading
-        try:
-            journal.load_profile()
-            if journal.profile:
-                debug_info['journal_profile_status'] = f"Loaded: {journal.profile.name}"
-                journal_activities = journal.get_recent_activities(limit=10)
-                debug_info['journal_activities_count'] = len(journal_activities)
-            else:
-                debug_info['journal_profile_status'] = "Not loaded"
-                debug_info['journal_activities_count'] = 0
-        except Exception as e:
-            debug_info['errors'].append(f"Journal loading error: {e}")
-
-        return f"""
-        <html>
-        <head><title>Debug Dashboard</title></head>
-        <body style="font-family: monospace; margin: 20px;">
-        <h1>Baby Journal Debug Dashboard</h1>
-
-        <h2>Database Status</h2>
-        <p><strong>Connection:</strong> {debug_info['database_status']}</p>
-
-        <h2>Profile Information</h2>
-        <pre>{debug_info['profile_info']}</pre>
-
-        <h2>Activity Summary</h2>
-        <pre>{debug_info['activity_summary']}</pre>
-
-        <h2>Journal Loading Status</h2>
-        <p><strong>Profile:</strong> {debug_info.get('journal_profile_status', 'Unknown')}</p>
-        <p><strong>Activities Count:</strong> {debug_info.get('journal_activities_count', 'Unknown')}</p>
-
-        <h2>Sample Activities</h2>
-        <pre>{debug_info['sample_activities']}</pre>
-
-        <h2>Errors</h2>
-        <pre>{debug_info['errors']}</pre>
+            # Test journal loading on local copies; the shared journal is left alone
+            try:
+                recent_rows = recent_query.result()
+                profile = BabyProfile.from_db_row(profile_data)
+                debug_info['journal_profile_status'] = f"Loaded: {profile.name}"
+                debug_info['journal_activities_count'] = len([BabyActivity.from_db_row(row) for row in recent_rows])
+
+                # Sample activities (latest 5)
+                debug_info['sample_activities'] = [
+                    {
+                        'id': a.get('id', 'N/A'),
+                        'timestamp': str(a.get('timestamp', 'N/A')),
+                        'category': a.get('category', 'N/A'),
+                        'activity_type': a.get('activity_type', 'N/A'),
+                        'description': a.get('description', 'N/A')[:100],
+                        'amount': a.get('amount'),
+                        'unit': a.get('unit')
+                    }
+                    for a in recent_rows[:5]
+                ]
+            except Exception as e:
+                debug_info['errors'].append(f"Journal loading error: {e}")
+        else:
+            debug_info['journal_profile_status'] = "Not loaded"
+            debug_info['journal_activities_count'] = 0
 
-        <p><a href="/">← Back to Home</a> | <a href="/analytics">Analytics Page</a></p>
-        </body>
-        </html>
-        """
+        return render_template('debug.html', debug_info=debug_info)
 
     except Exception as e:
         return f"Debug dashboard error: {str(e)}", 500
@@ -580,11 +589,24 @@ def api_add_activity():
         }), 400
 
 
+# (statistics dict, its JSON encoding) last served by /api/statistics
+_statistics_body = (None, b'')
+
+
 @app.route('/api/statistics')
 def api_statistics():
-    """API endpoint to get statistics."""
+    """API endpoint to get statistics.
+
+    get_statistics() hands back the same dict until its cache expires, so
+    the encoded body is kept alongside it and reused while it is current.
+    """
+    global _statistics_body
     stats = journal.get_statistics()
-    return jsonify(stats)
+    cached_stats, body = _statistics_body
+    if cached_stats is not stats:
+        body = app.json.dumps(stats).encode()
+        _statistics_body = (stats, body)
+    return app.response_class(body, mimetype="application/json")
 
 
 @app.route('/api/activity/<activity_id>', methods=['DELETE'])
@@ -617,15 +639,10 @@ def clear_all_activities():
         # For database version, we need to delete from database
         if journal.profile:
             try:
-                from app.database import get_db_service
-                db = get_db_service()
                 # Delete all activities for this profile
-                db.execute_query(
-                    "DELETE FROM baby_activities WHERE profile_id = %s",
-                    (journal.profile.id,),
-                    fetch=False
-                )
+                get_db_service().delete_all_activities(journal.profile.id)
                 journal.activities = []  # Clear cache
+                journal.invalidate_results()
                 flash('All activities have been deleted.', 'success')
             except Exception as e:
                 logger.error(f"Error clearing activities: {e}")
@@ -662,11 +679,13 @@ def api_update_activity(activity_id):
 
             # Use the journal's update method
             if journal.update_activity_by_id(activity_id, updates):
-                updated_activity = journal.get_activity_by_id(activity_id)
+                # Apply the changes locally instead of re-fetching the row
+                for field, value in updates.items():
+                    setattr(activity, field, value)
                 return jsonify({
                     'success': True,
                     'message': 'Activity updated successfully',
-                    'activity': updated_activity.to_dict()
+                    'activity': activity.to_dict()
                 })
             else:
                 return jsonify({
@@ -1408,25 +1427,39 @@ def api_recover_activities():
 
 @app.route('/api/activities', methods=['GET'])
 def api_get_activities():
-    """Get all activities via API."""
-    try:
-        # Load fresh activities from database
-        if journal.profile:
-            journal.load_activities()
+    """Get all activities via API.
 
+    ``limit`` and the ``before``/``before_id`` keyset cursor (the timestamp
+    and id of the last activity on the previous page) page through the
+    activities without loading them all.
+    """
+    try:
         # Get query parameters for filtering
         limit = request.args.get('limit', type=int)
         offset = request.args.get('offset', 0, type=int)
+        before = request.args.get('before', type=datetime.fromisoformat)
+        before_id = request.args.get('before_id')
 
-        activities = journal.get_recent_activities(limit=limit) if limit else journal.activities
+        if before or limit:
+            activities = journal.get_recent_activities(limit=limit, before_ts=before, before_id=before_id)
+            total = journal.get_statistics().get('total_activities', 0)
+        else:
+            # Load fresh activities from database
+            if journal.profile:
+                journal.load_activities()
+            activities = journal.activities
+            total = len(activities)
 
         # Convert to dict format
         activities_data = [activity.to_dict() for activity in activities[offset:]]
+        last = activities_data[-1] if activities_data else None
 
         return jsonify({
             'success': True,
             'activities': activities_data,
-            'total': len(journal.activities)
+            'total': total,
+            'next_before': last['timestamp'] if last else None,
+            'next_before_id': last['id'] if last else None
         })
     except Exception as e:
         logger.error(f"Error fetching activities: {e}")
@@ -1473,15 +1506,13 @@ def api_get_analytics_data():
             })
 
         # Process feeding data using the proven working logic
-        feeding_data = []
         breast_feeds = 0
         total_amount = 0
         valid_amounts = []
         dates_set = set()
 
-        # Import feeding type classifier (same as working route)
-        from app.whatsapp_parser import WhatsAppParser
-        parser = WhatsAppParser()
+        # (minute stamp, record) pairs, sorted on the stamp once all rows are read
+        stamped_records = []
 
         for row in feeding_rows:
             try:
@@ -1491,19 +1522,21 @@ def api_get_analytics_data():
                     amount = float(row['amount']) if row['amount'] != '' else 0
 
                 # Classify feeding type
-                feeding_type = parser._determine_feeding_type(row['description'] or '')
+                feeding_type = feeding_parser._determine_feeding_type(row['description'] or '')
                 if feeding_type == 'breast':
                     breast_feeds += 1
 
+                # "YYYY-MM-DD HH:MM" from one formatting call instead of two strftime calls
+                stamp = row['timestamp'].isoformat(' ', 'minutes')[:16]
                 feeding_record = {
                     'id': str(row['id']),
-                    'date': row['timestamp'].strftime('%Y-%m-%d'),
-                    'time': row['timestamp'].strftime('%H:%M'),
+                    'date': stamp[:10],
+                    'time': stamp[11:],
                     'amount': amount,
                     'description': row['description'],
                     'feeding_type': feeding_type
                 }
-                feeding_data.append(feeding_record)
+                stamped_records.append((stamp, feeding_record))
 
                 # Collect data for metrics
                 if amount > 0:
@@ -1516,7 +1549,8 @@ def api_get_analytics_data():
                 continue
 
         # Sort by timestamp
-        feeding_data.sort(key=lambda x: x['date'] + ' ' + x['time'])
+        stamped_records.sort(key=itemgetter(0))
+        feeding_data = [record for _, record in stamped_records]
 
         # Calculate metrics (same as working route)
         total_feeds = len(feeding_data)
@@ -1583,39 +1617,18 @@ def api_upload_whatsapp():
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             file.save(filepath)
 
-            # Parse WhatsApp chat
-            parser = WhatsAppParser()
-            messages = parser.parse_file(filepath)
-
-            # Process messages
-            processor = ActivityProcessor()
-            new_activities = []
-
-            for msg in messages:
-                activities = processor.process_message(msg['message'], msg['timestamp'])
-                for activity in activities:
-                    # Check for duplicates
-                    is_duplicate = False
-                    for existing in journal.activities:
-                        if (existing.timestamp == activity.timestamp and
-                            existing.type == activity.type and
-                            existing.details == activity.details):
-                            is_duplicate = True
-                            break
-
-                    if not is_duplicate:
-                        new_activities.append(activity)
-
-            # Add new activities
-            for activity in new_activities:
-                journal.add_activity(activity)
+            # Parse WhatsApp chat into activities
+            activities = processor.process_whatsapp_file(filepath)
+
+            # Insert in one batch; the database skips duplicates
+            new_activities = journal.add_activities(activities)
 
             # Clean up uploaded file
             os.remove(filepath)
 
             return jsonify({
                 'success': True,
-                'message': f'Successfully processed {len(messages)} messages',
+                'message': f'Successfully processed {len(activities)} activities',
                 'activities_added': len(new_activities),
                 'total_activities': len(journal.activities)
             })
@@ -1994,6 +2007,7 @@ def check_reminders():
 
 
 if __name__ == '__main__':
+    # Development server only; use `gunicorn wsgi:application` to deploy
     port = int(os.getenv('PORT', 5001))
     debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     app.run(debug=debug, host='0.0.0.0', port=port)
\ No newline at end of file
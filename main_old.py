@@ -2,30 +2,61 @@
 Flask web application for Baby Activity Journal.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, jsonify, flash
+from flask import (Flask, Request, Response, render_template, stream_template, request, redirect,
+                   url_for, jsonify, flash, get_flashed_messages)
 from flask_cors import CORS
+from collections import defaultdict
 from datetime import datetime, timedelta
 import os
+import tempfile
+import threading
+from jinja2.utils import htmlsafe_json_dumps
 from werkzeug.utils import secure_filename
 import json
 
+from app.json_provider import OrjsonProvider
+from app.upload_jobs import UploadJobs
 from app.models import BabyProfile, ActivityJournal, BabyActivity, ActivityCategory, ActivityType
 from app.activity_processor import ActivityProcessor
 from app.whatsapp_parser import WhatsAppParser
 from app.insights_generator import InsightsGenerator
 
+
+class UploadRequest(Request):
+    """Request that keeps form uploads in memory up to UPLOAD_SPOOL_SIZE.
+
+    Werkzeug's default spools anything over 500KB to a temporary file,
+    which for typical chat exports means every upload touches disk twice.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None,
+                         content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE, mode='w+b')
+
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+app.json = OrjsonProvider(app)
 CORS(app, origins=['http://localhost:3000'])
 app.secret_key = 'your-secret-key-change-in-production'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
+# Chunk size for copying streamed uploads to disk
+STREAM_CHUNK_SIZE = 128 * 1024
+# Multipart uploads up to this size stay in memory until saved
+UPLOAD_SPOOL_SIZE = 4 * 1024 * 1024
+
+# Distinguishes statistics ETags across restarts, since journal revisions start over
+_STATS_ETAG_PREFIX = os.urandom(4).hex()
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs('data', exist_ok=True)
 
 # Initialize journal and processor
 journal = ActivityJournal()
+journal.start_background_saves()
 processor = ActivityProcessor()
 
 # Load existing data
@@ -33,6 +64,43 @@ journal.load_profile()
 journal.load_activities()
 
 
+def _parse_form_date(value):
+    """Parse a YYYY-MM-DD form value to a datetime at midnight.
+
+    fromisoformat is much cheaper than strptime; strptime is kept for
+    non-padded values like 2024-1-5 that it used to accept.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%d')
+
+
+def _format_display_timestamp(iso_timestamp):
+    """Turn an ISO timestamp from to_dict() into 'YYYY-MM-DD HH:MM' by slicing."""
+    return iso_timestamp[:10] + ' ' + iso_timestamp[11:16]
+
+
+class ActivityDisplayRows:
+    """Activities formatted for display one row at a time.
+
+    Supports len() and truth tests, so templates can still use
+    ``activities|length`` and ``{% if activities %}``.
+    """
+
+    def __init__(self, activities):
+        self._activities = activities
+
+    def __len__(self):
+        return len(self._activities)
+
+    def __iter__(self):
+        for activity in self._activities:
+            act_dict = activity.to_dict()
+            act_dict['timestamp_formatted'] = _format_display_timestamp(act_dict['timestamp'])
+            yield act_dict
+
+
 @app.context_processor
 def inject_profile():
     """Make profile available to all templates."""
@@ -49,7 +117,7 @@ def index():
     activities_display = []
     for activity in recent_activities:
         act_dict = activity.to_dict()
-        act_dict['timestamp_formatted'] = datetime.fromisoformat(act_dict['timestamp']).strftime('%Y-%m-%d %H:%M')
+        act_dict['timestamp_formatted'] = _format_display_timestamp(act_dict['timestamp'])
         activities_display.append(act_dict)
 
     return render_template('index.html',
@@ -69,7 +137,7 @@ def setup():
         birth_height_str = request.form.get('birth_height')
 
         if name and birth_date_str:
-            birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d')
+            birth_date = _parse_form_date(birth_date_str)
 
             # Parse optional numeric fields
             birth_weight = float(birth_weight_str) if birth_weight_str else None
@@ -84,6 +152,20 @@ def setup():
     return render_template('setup.html', profile=journal.profile)
 
 
+def _import_whatsapp_file(filepath):
+    """Parse a saved WhatsApp export and add its activities to the journal."""
+    activities = processor.process_whatsapp_file(filepath)
+
+    # Add activities to journal
+    journal.add_activities(activities)
+
+    return len(activities)
+
+
+# Streamed uploads are imported here so the request returns straight away
+upload_jobs = UploadJobs(app.config['UPLOAD_FOLDER'], STREAM_CHUNK_SIZE)
+
+
 @app.route('/upload', methods=['GET', 'POST'])
 def upload_whatsapp():
     """Upload and process WhatsApp chat export."""
@@ -104,20 +186,77 @@ def upload_whatsapp():
 
             try:
                 # Process the WhatsApp file
-                activities = processor.process_whatsapp_file(filepath)
+                count = _import_whatsapp_file(filepath)
 
-                # Add activities to journal
-                for activity in activities:
-                    journal.add_activity(activity)
-
-                flash(f'Successfully processed {len(activities)} activities!', 'success')
+                flash(f'Successfully processed {count} activities!', 'success')
                 return redirect(url_for('index'))
 
             except Exception as e:
                 flash(f'Error processing file: {str(e)}', 'error')
                 return redirect(request.url)
 
-    return render_template('upload.html')
+    return render_template('upload.html', stream_upload_url=url_for('upload_whatsapp_stream'))
+
+
+@app.route('/upload_stream', methods=['POST', 'PUT'])
+def upload_whatsapp_stream():
+    """Upload a WhatsApp export sent as the raw request body.
+
+    The body is copied to disk in 128KB chunks instead of going through the
+    multipart form parser. The file name comes from the ``filename`` query
+    parameter. The import runs in the background; the 202 response points at
+    /api/upload_status for the result.
+    """
+    if request.mimetype == 'multipart/form-data':
+        return upload_whatsapp()
+
+    filename = secure_filename(request.args.get('filename', ''))
+    if not filename.endswith('.txt'):
+        return jsonify({
+            'success': False,
+            'message': 'A .txt WhatsApp export is required'
+        }), 400
+
+    job_id = upload_jobs.submit(request.stream, filename, _import_whatsapp_file)
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('api_upload_status', job_id=job_id)
+    }), 202
+
+
+@app.route('/api/upload_status/<job_id>')
+def api_upload_status(job_id):
+    """API endpoint to poll a streamed upload's import job."""
+    future = upload_jobs.get(job_id)
+    if future is None:
+        return jsonify({
+            'success': False,
+            'message': 'Upload job not found'
+        }), 404
+
+    if not future.done():
+        return jsonify({'state': 'pending'})
+
+    upload_jobs.discard(job_id)
+    error = future.exception()
+    if error is not None:
+        flash(f'Error processing file: {str(error)}', 'error')
+        return jsonify({
+            'state': 'error',
+            'success': False,
+            'message': f'Error processing file: {str(error)}',
+            'redirect': url_for('upload_whatsapp')
+        })
+
+    count = future.result()
+    flash(f'Successfully processed {count} activities!', 'success')
+    return jsonify({
+        'state': 'done',
+        'success': True,
+        'added': count,
+        'redirect': url_for('index')
+    })
 
 
 @app.route('/quick_add', methods=['GET', 'POST'])
@@ -159,33 +298,267 @@ def activities():
     date_filter = request.args.get('date')
     category_filter = request.args.get('category')
 
-    # Get activities based on filters
+    # Get activities based on filters, newest first
     if date_filter:
-        filter_date = datetime.strptime(date_filter, '%Y-%m-%d')
+        filter_date = _parse_form_date(date_filter).date()
         filtered_activities = journal.get_activities_by_date(filter_date)
     elif category_filter:
         filtered_activities = journal.get_activities_by_category(ActivityCategory(category_filter))
     else:
-        filtered_activities = journal.activities
-
-    # Sort by timestamp (newest first)
-    filtered_activities = sorted(filtered_activities, key=lambda x: x.timestamp, reverse=True)
-
-    # Format for display
-    activities_display = []
-    for activity in filtered_activities:
-        act_dict = activity.to_dict()
-        act_dict['timestamp_formatted'] = datetime.fromisoformat(act_dict['timestamp']).strftime('%Y-%m-%d %H:%M')
-        activities_display.append(act_dict)
+        filtered_activities = journal.get_sorted_activities()
 
     # Get categories for filter dropdown
     categories = [cat.value for cat in ActivityCategory]
 
-    return render_template('activities.html',
-                         activities=activities_display,
-                         categories=categories,
-                         selected_date=date_filter,
-                         selected_category=category_filter)
+    # Pop flashed messages now: the session cookie is written before a streamed
+    # body is rendered, so flashes read by the template would never be cleared
+    get_flashed_messages(with_categories=True)
+
+    # Stream the page; rows are formatted for display as the template reaches them
+    return Response(stream_template('activities.html',
+                                    activities=ActivityDisplayRows(filtered_activities),
+                                    categories=categories,
+                                    selected_date=date_filter,
+                                    selected_category=category_filter))
+
+
+# Activity types matched by substring in the analytics charts, resolved once
+_BOTTLE_TYPES = frozenset(t for t in ActivityType if 'bottle' in t.value)
+_NAP_TYPES = frozenset(t for t in ActivityType if 'nap' in t.value)
+_NIGHT_SLEEP_TYPES = frozenset(t for t in ActivityType if 'night' in t.value)
+
+
+def _compute_analytics(activities, today):
+    """Build the chart data for the analytics page in a single pass over activities."""
+    # Last 7 days, oldest first, as used by every daily trend
+    trend_dates = [today - timedelta(days=i) for i in range(6, -1, -1)]
+    cutoff = trend_dates[0]
+
+    hour_distribution = [0] * 24
+    weekday_distribution = [0] * 7
+    daily_count = defaultdict(int)
+
+    # Per-day buckets only hold the last 7 days; amount/duration sums only
+    # get an entry once a day has a non-empty value, matching the old
+    # "sum(...) if values else 0" results
+    feeding_count = 0
+    feeding_amount_total = 0
+    feeding_amount_count = 0
+    bottle_feeds = 0
+    feeding_day_count = defaultdict(int)
+    feeding_day_amount = {}
+
+    sleep_count = 0
+    sleep_minutes_total = 0
+    sleep_has_duration = False
+    night_minutes_total = 0
+    night_duration_count = 0
+    nap_count = 0
+    day_sleep_minutes = 0
+    sleep_day_count = defaultdict(int)
+    sleep_day_minutes = {}
+
+    extraction_count = 0
+    extraction_day_amount = {}
+
+    for activity in activities:
+        timestamp = activity.timestamp
+        hour = timestamp.hour
+        hour_distribution[hour] += 1
+        weekday_distribution[timestamp.weekday()] += 1
+
+        day = timestamp.date()
+        recent = cutoff <= day <= today
+        if recent:
+            daily_count[day] += 1
+
+        category = activity.category
+        activity_type = activity.activity_type
+        amount = activity.amount
+
+        if category is ActivityCategory.FEEDING:
+            feeding_count += 1
+            if amount:
+                feeding_amount_total += amount
+                feeding_amount_count += 1
+            if activity_type in _BOTTLE_TYPES:
+                bottle_feeds += 1
+            if recent:
+                feeding_day_count[day] += 1
+                if amount:
+                    feeding_day_amount[day] = feeding_day_amount.get(day, 0) + amount
+
+        elif category is ActivityCategory.SLEEP:
+            sleep_count += 1
+            duration = activity.duration_minutes
+            if activity_type in _NAP_TYPES:
+                nap_count += 1
+            if duration:
+                sleep_has_duration = True
+                sleep_minutes_total += duration
+                if activity_type in _NIGHT_SLEEP_TYPES:
+                    night_minutes_total += duration
+                    night_duration_count += 1
+                if 6 <= hour < 21:  # 6 AM to 9 PM
+                    day_sleep_minutes += duration
+            if recent:
+                sleep_day_count[day] += 1
+                if duration:
+                    sleep_day_minutes[day] = sleep_day_minutes.get(day, 0) + duration
+
+        if activity_type is ActivityType.BREAST_MILK_EXTRACTION:
+            extraction_count += 1
+            if recent and amount:
+                extraction_day_amount[day] = extraction_day_amount.get(day, 0) + amount
+
+    # Recent 7 days trend
+    daily_counts = [{
+        'date': date.strftime('%m/%d'),
+        'count': daily_count[date]
+    } for date in trend_dates]
+
+    # Calculate feeding insights
+    feeding_insights = {
+        'avg_amount': 0,
+        'avg_gap_hours': 0,
+        'bottle_percentage': 0,
+        'daily_trend': [],
+        'daily_avg_total': 0,
+        'weekly_avg_total': 0
+    }
+
+    if feeding_count:
+        # Average amount
+        if feeding_amount_count:
+            feeding_insights['avg_amount'] = round(feeding_amount_total / feeding_amount_count, 1)
+
+        # Calculate daily feeding trend for last 7 days
+        feeding_insights['daily_trend'] = [{
+            'date': date.strftime('%a'),
+            'amount': round(feeding_day_amount.get(date, 0), 1),
+            'count': feeding_day_count[date]
+        } for date in trend_dates]
+
+        # Bottle percentage
+        feeding_insights['bottle_percentage'] = round((bottle_feeds / feeding_count) * 100, 1)
+
+        # Daily and weekly average totals, only counting days with feeding data
+        daily_totals = [feeding_day_amount.get(date, 0) for date in reversed(trend_dates)]
+        daily_totals = [total for total in daily_totals if total > 0]
+        if daily_totals:
+            feeding_insights['daily_avg_total'] = round(sum(daily_totals) / len(daily_totals), 1)
+            feeding_insights['weekly_avg_total'] = round(sum(daily_totals), 1)
+
+    # Calculate sleep insights
+    sleep_insights = {
+        'total_daily_sleep': 0,
+        'night_sleep_avg': 0,
+        'nap_count': 0,
+        'sleep_efficiency': 0,
+        'sleep_pattern': [],
+        'day_sleep_avg': 0,
+        'daily_trend': []
+    }
+
+    if sleep_count:
+        # Calculate average daily sleep
+        if sleep_has_duration:
+            sleep_insights['total_daily_sleep'] = round(sleep_minutes_total / 60, 1)
+
+            if night_duration_count:
+                sleep_insights['night_sleep_avg'] = round(night_minutes_total / night_duration_count / 60, 1)
+
+            sleep_insights['nap_count'] = nap_count
+            sleep_insights['sleep_efficiency'] = min(95, round((sleep_minutes_total / (24 * 60)) * 100 * 2, 1))  # Rough calculation
+
+            # Day sleep (6 AM to 9 PM)
+            sleep_insights['day_sleep_avg'] = round(day_sleep_minutes / 60, 1) if day_sleep_minutes > 0 else 0
+
+        # Calculate daily sleep trend for last 7 days
+        sleep_insights['daily_trend'] = [{
+            'date': date.strftime('%a'),
+            'hours': round(sleep_day_minutes[date] / 60, 1) if date in sleep_day_minutes else 0,
+            'count': sleep_day_count[date]
+        } for date in trend_dates]
+
+    # Calculate extraction insights
+    extraction_insights = {
+        'daily_avg': 0,
+        'weekly_avg': 0,
+        'daily_trend': []
+    }
+
+    if extraction_count:
+        # Calculate daily extraction trend for last 7 days
+        extraction_insights['daily_trend'] = [{
+            'date': date.strftime('%a'),
+            'amount': round(extraction_day_amount.get(date, 0), 1)
+        } for date in trend_dates]
+
+        # Daily and weekly averages, only counting days with extraction data
+        daily_totals = [extraction_day_amount.get(date, 0) for date in reversed(trend_dates)]
+        daily_totals = [total for total in daily_totals if total > 0]
+        if daily_totals:
+            extraction_insights['daily_avg'] = round(sum(daily_totals) / len(daily_totals), 1)
+            extraction_insights['weekly_avg'] = round(sum(daily_totals), 1)
+
+    # Generate dynamic insights
+    insights_generator = InsightsGenerator(activities)
+    feeding_dynamic_insights = insights_generator.generate_feeding_insights()
+    sleep_dynamic_insights = insights_generator.generate_sleep_insights()
+
+    chart_data = {
+        'hourly': hour_distribution,
+        'weekday': weekday_distribution,
+        'daily_trend': daily_counts,
+        'feeding_insights': feeding_insights,
+        'sleep_insights': sleep_insights,
+        'extraction_insights': extraction_insights,
+        'feeding_dynamic_insights': feeding_dynamic_insights,
+        'sleep_dynamic_insights': sleep_dynamic_insights
+    }
+
+    return chart_data
+
+
+# Last (revision, today, chart_data, chart_json) built for the analytics page
+_analytics_cache = None
+_analytics_cache_lock = threading.Lock()
+
+
+def _serialize_chart_series(chart_data):
+    """Pre-render the series the analytics template embeds as JSON.
+
+    Output matches the ``|tojson`` filter, so the cached fragments can be
+    dropped into the page without re-serializing on every request.
+    """
+    def dumps(value):
+        return htmlsafe_json_dumps(value, dumps=app.json.dumps)
+
+    return {
+        'feeding_trend': dumps(chart_data['feeding_insights']['daily_trend']),
+        'sleep_trend': dumps(chart_data['sleep_insights']['daily_trend']),
+        'hourly': dumps(chart_data['hourly']),
+        'extraction_trend': dumps(chart_data['extraction_insights']['daily_trend']),
+    }
+
+
+def _get_analytics_chart_data():
+    """Return (chart_data, chart_json), rebuilt only when activities or the date change."""
+    global _analytics_cache
+    if not journal.activities:
+        return None, None
+
+    today = datetime.now().date()
+    with _analytics_cache_lock:
+        cache = _analytics_cache
+        if cache is not None and cache[0] == journal.revision and cache[1] == today:
+            return cache[2], cache[3]
+
+        chart_data = _compute_analytics(journal.activities, today)
+        chart_json = _serialize_chart_series(chart_data)
+        _analytics_cache = (journal.revision, today, chart_data, chart_json)
+        return chart_data, chart_json
 
 
 @app.route('/analytics')
@@ -194,185 +567,12 @@ def analytics():
     stats = journal.get_statistics()
 
     # Prepare data for charts
-    if journal.activities:
-        # Activities by hour of day
-        hour_distribution = [0] * 24
-        for activity in journal.activities:
-            hour = activity.timestamp.hour
-            hour_distribution[hour] += 1
-
-        # Activities by day of week
-        weekday_distribution = [0] * 7
-        for activity in journal.activities:
-            weekday = activity.timestamp.weekday()
-            weekday_distribution[weekday] += 1
-
-        # Recent 7 days trend
-        today = datetime.now().date()
-        daily_counts = []
-        for i in range(6, -1, -1):
-            date = today - timedelta(days=i)
-            count = len([a for a in journal.activities if a.timestamp.date() == date])
-            daily_counts.append({
-                'date': date.strftime('%m/%d'),
-                'count': count
-            })
-
-        # Calculate feeding insights
-        feeding_activities = [a for a in journal.activities if a.category.value == 'feeding']
-        feeding_insights = {
-            'avg_amount': 0,
-            'avg_gap_hours': 0,
-            'bottle_percentage': 0,
-            'daily_trend': [],
-            'daily_avg_total': 0,
-            'weekly_avg_total': 0
-        }
-
-        if feeding_activities:
-            # Average amount
-            amounts = [a.amount for a in feeding_activities if a.amount]
-            if amounts:
-                feeding_insights['avg_amount'] = round(sum(amounts) / len(amounts), 1)
-
-            # Calculate daily feeding trend for last 7 days
-            for i in range(6, -1, -1):
-                date = today - timedelta(days=i)
-                day_feedings = [a for a in feeding_activities if a.timestamp.date() == date]
-                daily_amounts = [a.amount for a in day_feedings if a.amount]
-                total_amount = sum(daily_amounts) if daily_amounts else 0
-                feeding_insights['daily_trend'].append({
-                    'date': date.strftime('%a'),
-                    'amount': round(total_amount, 1),
-                    'count': len(day_feedings)
-                })
-
-            # Bottle percentage
-            bottle_feeds = len([a for a in feeding_activities if 'bottle' in a.activity_type.value])
-            feeding_insights['bottle_percentage'] = round((bottle_feeds / len(feeding_activities)) * 100, 1)
-
-            # Daily and weekly average totals
-            daily_totals = []
-            for i in range(7):  # Last 7 days
-                date = today - timedelta(days=i)
-                day_feedings = [a for a in feeding_activities if a.timestamp.date() == date]
-                daily_amounts = [a.amount for a in day_feedings if a.amount]
-                daily_total = sum(daily_amounts) if daily_amounts else 0
-                if daily_total > 0:  # Only count days with feeding data
-                    daily_totals.append(daily_total)
-
-            if daily_totals:
-                feeding_insights['daily_avg_total'] = round(sum(daily_totals) / len(daily_totals), 1)
-                feeding_insights['weekly_avg_total'] = round(sum(daily_totals), 1)
-
-        # Calculate sleep insights
-        sleep_activities = [a for a in journal.activities if a.category.value == 'sleep']
-        sleep_insights = {
-            'total_daily_sleep': 0,
-            'night_sleep_avg': 0,
-            'nap_count': 0,
-            'sleep_efficiency': 0,
-            'sleep_pattern': [],
-            'day_sleep_avg': 0,
-            'daily_trend': []
-        }
-
-        if sleep_activities:
-            # Calculate average daily sleep
-            durations = [a.duration_minutes for a in sleep_activities if a.duration_minutes]
-            if durations:
-                total_minutes = sum(durations)
-                sleep_insights['total_daily_sleep'] = round(total_minutes / 60, 1)
-
-                # Sleep pattern by type
-                night_sleeps = [a for a in sleep_activities if 'night' in a.activity_type.value.lower()]
-                naps = [a for a in sleep_activities if 'nap' in a.activity_type.value.lower()]
-
-                if night_sleeps:
-                    night_durations = [a.duration_minutes for a in night_sleeps if a.duration_minutes]
-                    if night_durations:
-                        sleep_insights['night_sleep_avg'] = round(sum(night_durations) / len(night_durations) / 60, 1)
-
-                sleep_insights['nap_count'] = len(naps)
-                sleep_insights['sleep_efficiency'] = min(95, round((total_minutes / (24 * 60)) * 100 * 2, 1))  # Rough calculation
-
-                # Calculate day sleep (6 AM to 9 PM)
-                day_sleep_minutes = 0
-                for activity in sleep_activities:
-                    if activity.duration_minutes:
-                        hour = activity.timestamp.hour
-                        if 6 <= hour < 21:  # 6 AM to 9 PM
-                            day_sleep_minutes += activity.duration_minutes
-
-                sleep_insights['day_sleep_avg'] = round(day_sleep_minutes / 60, 1) if day_sleep_minutes > 0 else 0
-
-            # Calculate daily sleep trend for last 7 days
-            for i in range(6, -1, -1):
-                date = today - timedelta(days=i)
-                day_sleeps = [a for a in sleep_activities if a.timestamp.date() == date]
-                daily_durations = [a.duration_minutes for a in day_sleeps if a.duration_minutes]
-                total_hours = round(sum(daily_durations) / 60, 1) if daily_durations else 0
-                sleep_insights['daily_trend'].append({
-                    'date': date.strftime('%a'),
-                    'hours': total_hours,
-                    'count': len(day_sleeps)
-                })
-
-        # Calculate extraction insights
-        extraction_activities = [a for a in journal.activities if a.activity_type.value == 'breast_milk_extraction']
-        extraction_insights = {
-            'daily_avg': 0,
-            'weekly_avg': 0,
-            'daily_trend': []
-        }
-
-        if extraction_activities:
-            # Calculate daily extraction trend for last 7 days
-            for i in range(6, -1, -1):
-                date = today - timedelta(days=i)
-                day_extractions = [a for a in extraction_activities if a.timestamp.date() == date]
-                daily_amounts = [a.amount for a in day_extractions if a.amount]
-                total_amount = sum(daily_amounts) if daily_amounts else 0
-                extraction_insights['daily_trend'].append({
-                    'date': date.strftime('%a'),
-                    'amount': round(total_amount, 1)
-                })
-
-            # Daily and weekly averages
-            daily_totals = []
-            for i in range(7):  # Last 7 days
-                date = today - timedelta(days=i)
-                day_extractions = [a for a in extraction_activities if a.timestamp.date() == date]
-                daily_amounts = [a.amount for a in day_extractions if a.amount]
-                daily_total = sum(daily_amounts) if daily_amounts else 0
-                if daily_total > 0:  # Only count days with extraction data
-                    daily_totals.append(daily_total)
-
-            if daily_totals:
-                extraction_insights['daily_avg'] = round(sum(daily_totals) / len(daily_totals), 1)
-                extraction_insights['weekly_avg'] = round(sum(daily_totals), 1)
-
-        # Generate dynamic insights
-        insights_generator = InsightsGenerator(journal.activities)
-        feeding_dynamic_insights = insights_generator.generate_feeding_insights()
-        sleep_dynamic_insights = insights_generator.generate_sleep_insights()
-
-        chart_data = {
-            'hourly': hour_distribution,
-            'weekday': weekday_distribution,
-            'daily_trend': daily_counts,
-            'feeding_insights': feeding_insights,
-            'sleep_insights': sleep_insights,
-            'extraction_insights': extraction_insights,
-            'feeding_dynamic_insights': feeding_dynamic_insights,
-            'sleep_dynamic_insights': sleep_dynamic_insights
-        }
-    else:
-        chart_data = None
+    chart_data, chart_json = _get_analytics_chart_data()
 
     return render_template('analytics_enhanced.html',
                          statistics=stats,
-                         chart_data=chart_data)
+                         chart_data=chart_data,
+                         chart_json=chart_json)
 
 
 @app.route('/api/activity', methods=['POST'])
@@ -404,9 +604,18 @@ def api_add_activity():
 
 @app.route('/api/statistics')
 def api_statistics():
-    """API endpoint to get statistics."""
-    stats = journal.get_statistics()
-    return jsonify(stats)
+    """API endpoint to get statistics.
+
+    Responses carry a weak ETag so polling clients get a bodyless 304 until
+    the journal changes.
+    """
+    etag = f"{_STATS_ETAG_PREFIX}-{journal.get_statistics_tag()}"
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(journal.get_statistics())
+    response.set_etag(etag, weak=True)
+    return response
 
 
 @app.route('/api/activity/<activity_id>', methods=['DELETE'])
@@ -547,4 +756,6 @@ def api_get_profile():
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5001)
\ No newline at end of file
+    # Development server only (production serves main_db through wsgi.py)
+    debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+    app.run(debug=debug, port=5001)
\ No newline at end of file
@@ -20,6 +20,9 @@ from app.models import BabyActivity as JSONBabyActivity, BabyProfile as JSONBaby
 from app.models_db import BabyActivity as DBBabyActivity, BabyProfile as DBBabyProfile, ActivityJournal as DBActivityJournal
 from app.database import get_db_service
 
+# Activities inserted per database round trip
+MIGRATION_BATCH_SIZE = 1000
+
 
 def migrate_profile(json_journal: JSONActivityJournal, db_journal: DBActivityJournal) -> bool:
     """Migrate baby profile from JSON to database."""
@@ -63,40 +66,41 @@ def migrate_activities(json_journal: JSONActivityJournal, db_journal: DBActivity
         return 0
 
     migrated_count = 0
+    skipped_count = 0
     failed_count = 0
 
-    for json_activity in json_journal.activities:
+    db_activities = [
+        DBBabyActivity(
+            timestamp=json_activity.timestamp,
+            category=json_activity.category,
+            activity_type=json_activity.activity_type,
+            description=json_activity.description,
+            amount=json_activity.amount,
+            unit=json_activity.unit,
+            duration_minutes=json_activity.duration_minutes,
+            notes=json_activity.notes,
+            tags=json_activity.tags,
+            source=json_activity.source,
+            sender=json_activity.sender,
+            profile_id=db_journal.profile.id
+        )
+        for json_activity in json_journal.activities
+    ]
+
+    # Save in multi-row batches instead of one INSERT per activity
+    for start in range(0, len(db_activities), MIGRATION_BATCH_SIZE):
+        batch = db_activities[start:start + MIGRATION_BATCH_SIZE]
         try:
-            # Create new database activity
-            db_activity = DBBabyActivity(
-                timestamp=json_activity.timestamp,
-                category=json_activity.category,
-                activity_type=json_activity.activity_type,
-                description=json_activity.description,
-                amount=json_activity.amount,
-                unit=json_activity.unit,
-                duration_minutes=json_activity.duration_minutes,
-                notes=json_activity.notes,
-                tags=json_activity.tags,
-                source=json_activity.source,
-                sender=json_activity.sender,
-                profile_id=db_journal.profile.id
-            )
-
-            # Save to database
-            if db_activity.save():
-                migrated_count += 1
-                if migrated_count % 10 == 0:
-                    print(f"  Migrated {migrated_count} activities...")
-            else:
-                failed_count += 1
-                print(f"  ✗ Failed to save activity: {json_activity.description}")
-
+            saved = db_journal.add_activities(batch)
+            migrated_count += len(saved)
+            skipped_count += len(batch) - len(saved)
+            print(f"  Migrated {migrated_count} activities...")
         except Exception as e:
-            failed_count += 1
-            print(f"  ✗ Error migrating activity: {e}")
+            failed_count += len(batch)
+            print(f"  ✗ Error migrating {len(batch)} activities: {e}")
 
-    print(f"✓ Migration complete: {migrated_count} activities migrated, {failed_count} failed")
+    print(f"✓ Migration complete: {migrated_count} activities migrated, "
+          f"{skipped_count} duplicates skipped, {failed_count} failed")
     return migrated_count
 
 
@@ -0,0 +1,8 @@
+-- Migration: Add composite index for recent-activity listing
+-- Created: 2026-10-15
+-- Description: Lets "latest activities for a profile" queries (and keyset
+-- pagination with timestamp < cursor) read the index in order instead of
+-- scanning and sorting all of the profile's rows
+
+CREATE INDEX IF NOT EXISTS idx_activities_profile_ts
+    ON baby_activities(profile_id, timestamp DESC);
@@ -3,9 +3,12 @@
 Test the improved WhatsApp parser with time extraction and feeding type detection.
 """
 
-from app.whatsapp_parser import WhatsAppParser
+from app.whatsapp_parser import (WhatsAppParser, _DATE_FORMATS, _TIME_FORMATS,
+                                 _SIMPLE_DATE_RE, _SIMPLE_TIME_RE,
+                                 _fast_parse_date, _fast_parse_time,
+                                 _parse_date_cached, _parse_time_cached)
 from app.activity_processor import ActivityProcessor
-from datetime import datetime
+from datetime import date, datetime, time
 
 def test_improved_parsing():
     """Test the new features."""
@@ -58,5 +61,70 @@ def test_improved_parsing():
 
         print()
 
+def _strptime_first(value, formats):
+    """Parse with the first matching strptime format, or None."""
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def test_fast_header_parsing():
+    """The strptime-free date/time parsers must agree with strptime."""
+    print("🕒 Testing fast header date/time parsing\n")
+
+    date_cases = {
+        '21/09/25': date(2025, 9, 21),
+        '31/12/68': date(2068, 12, 31),    # %y pivot: 00-68 -> 2000s
+        '31/12/69': date(1969, 12, 31),    # 69-99 -> 1900s
+        '13/02/2024': date(2024, 2, 13),   # day-first
+        '02/13/2024': date(2024, 2, 13),   # month-first fallback
+        '12/02/2024': date(2024, 2, 12),   # ambiguous, day-first wins
+        '1/2/24': date(2024, 2, 1),
+        '32/13/2024': None,
+        '2024-01-02': None,
+    }
+    for value, expected in date_cases.items():
+        reference = _strptime_first(value, _DATE_FORMATS)
+        reference = reference.date() if reference else None
+        fast = _fast_parse_date(value)
+        assert reference == expected, f"strptime gave {reference} for {value!r}"
+        # Shapes the fast path claims must match strptime; the rest defer to it
+        fast_expected = expected if _SIMPLE_DATE_RE.fullmatch(value) else None
+        assert fast == fast_expected, f"fast path gave {fast} for {value!r}"
+        assert _parse_date_cached(value) == expected, f"{value!r} parsed wrong"
+        print(f"✓ {value!r} -> {expected}")
+
+    time_cases = {
+        '12:05 AM': time(0, 5),
+        '12:05 PM': time(12, 5),
+        '12:30:15 AM': time(0, 30, 15),
+        '1:18 PM': time(13, 18),
+        '11:59:59 PM': time(23, 59, 59),
+        '0:30 AM': None,                   # %I rejects hour 0
+        '13:00 PM': None,
+        '3:32:40 pm': time(15, 32, 40),    # lowercase period
+        '3:32\u202fPM': time(15, 32),      # narrow no-break space (newer exports)
+        '0:30': time(0, 30),
+        '23:59:59': time(23, 59, 59),
+        '24:00': None,
+        '9:60': None,
+    }
+    for value, expected in time_cases.items():
+        reference = _strptime_first(value, _TIME_FORMATS)
+        reference = reference.time() if reference else None
+        fast = _fast_parse_time(value)
+        assert reference == expected, f"strptime gave {reference} for {value!r}"
+        fast_expected = expected if _SIMPLE_TIME_RE.fullmatch(value) else None
+        assert fast == fast_expected, f"fast path gave {fast} for {value!r}"
+        assert _parse_time_cached(value) == expected, f"{value!r} parsed wrong"
+        print(f"✓ {value!r} -> {expected}")
+
+    print()
+
+
 if __name__ == "__main__":
-    test_improved_parsing()
\ No newline at end of file
+    test_improved_parsing()
+    test_fast_header_parsing()
\ No newline at end of file
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test the prepared statement support in app.database without a database:
+the %s -> $n placeholder rewrite, re-preparing after a schema change and the
+DB_PREPARED_STATEMENTS=false fallback.
+"""
+
+import psycopg2
+
+from app.database import DatabaseConnection, _prepare_placeholders
+
+
+class RecordingCursor:
+    """Cursor stand-in that records the SQL it is given."""
+
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.log.append((sql, params))
+
+    def fetchall(self):
+        return [{'id': 1}]
+
+
+class RecordingConnection:
+    """Connection stand-in handing out RecordingCursors."""
+
+    def __init__(self):
+        self.log = []
+
+    def cursor(self, cursor_factory=None):
+        return RecordingCursor(self.log)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def _connection(use_prepared_statements, conn=None):
+    """A DatabaseConnection that uses ``conn`` instead of a real pool."""
+    db = DatabaseConnection.__new__(DatabaseConnection)
+    db.connection_pool = None
+    db.use_prepared_statements = use_prepared_statements
+    db._prepared_statements = {}
+    db.get_connection = lambda: conn
+    db.return_connection = lambda c: None
+    return db
+
+
+def test_placeholder_rewrite():
+    """%s placeholders become $1, $2, ... in order."""
+    print("Testing _prepare_placeholders()...")
+
+    assert _prepare_placeholders("SELECT * FROM t WHERE id = %s;") == "SELECT * FROM t WHERE id = $1"
+    print("✓ Single placeholder, trailing semicolon dropped")
+
+    query = "SELECT * FROM t WHERE a = %s AND (b, c) < (%s, %s) LIMIT %s"
+    assert _prepare_placeholders(query) == "SELECT * FROM t WHERE a = $1 AND (b, c) < ($2, $3) LIMIT $4"
+    print("✓ Placeholders numbered in order")
+
+    assert _prepare_placeholders("SELECT 1") == "SELECT 1"
+    print("✓ Query without placeholders unchanged")
+
+    assert _prepare_placeholders("SELECT * FROM t WHERE a = 'x' AND b = %s") == "SELECT * FROM t WHERE a = 'x' AND b = $1"
+    print("✓ Quoted literals without %s are allowed")
+
+    for bad in ("SELECT * FROM t WHERE a LIKE 'x%%' AND b = %s",
+                "SELECT * FROM t WHERE a = '%s' AND b = %s"):
+        try:
+            _prepare_placeholders(bad)
+        except ValueError:
+            print(f"✓ Rejects {bad!r}")
+        else:
+            raise AssertionError(f"Should reject {bad!r}")
+
+
+def test_execute_prepared():
+    """Statements are prepared once per connection, then executed by name."""
+    print("Testing execute_prepared()...")
+
+    conn = RecordingConnection()
+    db = _connection(True, conn)
+    query = "SELECT * FROM baby_activities WHERE id = %s AND profile_id = %s;"
+
+    assert db.execute_prepared("by_id", query, ('a', 'p')) == [{'id': 1}]
+    assert db.execute_prepared("by_id", query, ('b', 'p')) == [{'id': 1}]
+    assert conn.log == [
+        ("PREPARE by_id AS SELECT * FROM baby_activities WHERE id = $1 AND profile_id = $2", None),
+        ("EXECUTE by_id (%s, %s)", ('a', 'p')),
+        ("EXECUTE by_id (%s, %s)", ('b', 'p')),
+    ], conn.log
+    print("✓ Prepared once, executed twice")
+
+
+class StaleConnection(RecordingConnection):
+    """Connection whose first EXECUTE fails as after a migration added a column."""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+    def cursor(self, cursor_factory=None):
+        connection = self
+        cursor = RecordingCursor(self.log)
+        execute = cursor.execute
+
+        def stale_execute(sql, params=None):
+            execute(sql, params)
+            if sql.startswith('EXECUTE') and not connection.failed:
+                connection.failed = True
+                raise psycopg2.errors.FeatureNotSupported("cached plan must not change result type")
+
+        cursor.execute = stale_execute
+        return cursor
+
+
+def test_reprepare_after_schema_change():
+    """A statement invalidated by a schema change is prepared again once."""
+    print("Testing re-preparing after a schema change...")
+
+    conn = StaleConnection()
+    db = _connection(True, conn)
+    query = "SELECT id FROM baby_activities WHERE id = %s;"
+
+    assert db.execute_prepared("by_id", query, ('a',)) == [{'id': 1}]
+    assert [sql for sql, _ in conn.log] == [
+        "PREPARE by_id AS SELECT id FROM baby_activities WHERE id = $1",
+        "EXECUTE by_id (%s)",
+        "DEALLOCATE by_id",
+        "PREPARE by_id AS SELECT id FROM baby_activities WHERE id = $1",
+        "EXECUTE by_id (%s)",
+    ], conn.log
+    assert db._prepared_statements[conn] == {'by_id'}
+    print("✓ Deallocated, prepared again and executed")
+
+
+def test_prepared_statements_disabled():
+    """With DB_PREPARED_STATEMENTS=false the query runs unchanged."""
+    print("Testing the DB_PREPARED_STATEMENTS=false fallback...")
+
+    calls = []
+    db = _connection(False)
+    db.execute_query = lambda query, params=None, fetch=True: calls.append((query, params, fetch)) or []
+
+    query = "DELETE FROM baby_activities WHERE id = %s;"
+    db.execute_prepared("delete_activity", query, ('a',), fetch=False)
+    assert calls == [(query, ('a',), False)], calls
+    print("✓ Falls back to execute_query with the original query")
+
+
+def main():
+    """Run all tests."""
+    test_placeholder_rewrite()
+    print()
+    test_execute_prepared()
+    print()
+    test_reprepare_after_schema_change()
+    print()
+    test_prepared_statements_disabled()
+    print()
+    print("All prepared statement tests passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+WSGI entrypoint for running the Baby Activity Journal under gunicorn.
+
+    gunicorn wsgi:application
+
+Worker settings are read from gunicorn.conf.py.
+"""
+
+from main_db import app
+
+application = app